@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Kayıtlı videolar ve görüntü veri setleri üzerinde çevrimdışı toplu tespit.
+Kod çözme birden fazla süreçte paralel yapılır, çıkarım DeGirum predict_batch ile toplu yürütülür.
+Etiketler verilirse görüntü düzeyinde kesinlik (precision), duyarlılık (recall) ve gecikme istatistikleri hesaplanır.
+
+Kullanım:
+    python batch.py kayitlar/ veri_seti/images --labels veri_seti/labels --output sonuc.jsonl.gz
+"""
+
+import os
+import sys
+import json
+import gzip
+import time
+import queue
+import logging
+import argparse
+import multiprocessing as mp
+
+import cv2
+
+from config import CONFIG, MODEL_CONFIG
+from utils import setup_logging, parse_detections
+
+# Loglama
+logger = logging.getLogger("hailo_fire_smoke_detection.batch")
+
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".bmp"}
+VIDEO_EXTENSIONS = {".mp4", ".avi", ".mkv", ".mov", ".ts"}
+INPUT_SIZE = 640
+
+
+def collect_sources(paths):
+    """Verilen dosya ve dizinlerdeki görüntü ve videoları tekrarsız, sıralı listele"""
+    sources = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                for name in sorted(files):
+                    sources.append(os.path.join(root, name))
+        else:
+            sources.append(path)
+
+    # Dizin ve içindeki bir dosya birlikte verilirse dosya bir kez işlenir
+    unique = {}
+    for source in sorted(sources):
+        if os.path.splitext(source)[1].lower() in IMAGE_EXTENSIONS | VIDEO_EXTENSIONS:
+            unique.setdefault(os.path.realpath(source), source)
+    return sorted(unique.values())
+
+
+def decode_source(path, frame_queue, frame_step):
+    """Tek bir görüntü ya da videoyu çöz, model boyutuna küçült ve kuyruğa ekle"""
+    if os.path.splitext(path)[1].lower() in IMAGE_EXTENSIONS:
+        frame = cv2.imread(path)
+        if frame is not None:
+            frame_queue.put((path, 0, frame.shape[:2], cv2.resize(frame, (INPUT_SIZE, INPUT_SIZE))))
+        return
+
+    cap = cv2.VideoCapture(path)
+    try:
+        frame_index = 0
+        while True:
+            # Atlanan karelerde yalnızca grab() çağrılır, kod çözme maliyeti düşer
+            if frame_index % frame_step != 0:
+                if not cap.grab():
+                    break
+                frame_index += 1
+                continue
+
+            ret, frame = cap.read()
+            if not ret:
+                break
+            frame_queue.put((path, frame_index, frame.shape[:2], cv2.resize(frame, (INPUT_SIZE, INPUT_SIZE))))
+            frame_index += 1
+    finally:
+        cap.release()
+
+
+def decode_worker(task_queue, frame_queue, frame_step):
+    """Kaynak dosyaları sırayla çöz (ayrı süreçte çalışır)"""
+    try:
+        while True:
+            path = task_queue.get()
+            if path is None:
+                break
+
+            try:
+                decode_source(path, frame_queue, frame_step)
+            except Exception as e:
+                # Bozuk bir dosya diğer kaynakların işlenmesini durdurmasın
+                logger.error("Kod çözme hatası (%s): %s", path, e)
+    finally:
+        # Hata durumunda da bu sürecin bittiğini bildir
+        frame_queue.put(None)
+
+
+def load_labels(labels_dir, image_path):
+    """YOLO biçimindeki etiket dosyasından görüntüdeki sınıf kimliklerini oku"""
+    stem = os.path.splitext(os.path.basename(image_path))[0]
+    label_path = os.path.join(labels_dir, stem + ".txt")
+    if not os.path.exists(label_path):
+        return None
+
+    class_ids = set()
+    with open(label_path) as f:
+        for line in f:
+            parts = line.split()
+            if parts:
+                class_ids.add(int(float(parts[0])))
+    return class_ids
+
+
+def percentile(values, fraction):
+    """Sıralı listeden yüzdelik değer"""
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, int(round(fraction * (len(values) - 1))))
+    return values[index]
+
+
+class BatchEvaluator:
+    """Görüntü düzeyinde sınıf bazlı doğruluk ve gecikme istatistiklerini topla"""
+
+    def __init__(self, class_names, threshold, labels_dir=None):
+        self.class_names = class_names
+        self.threshold = threshold
+        self.labels_dir = labels_dir
+        self.counts = {class_id: {"tp": 0, "fp": 0, "fn": 0} for class_id in range(len(class_names))}
+        self.latencies = []
+        self.frames = 0
+        self.labelled = 0
+
+    def add(self, source, detections, latency):
+        """Tek bir karenin sonucunu ekle"""
+        self.frames += 1
+        self.latencies.append(latency)
+
+        if self.labels_dir is None or os.path.splitext(source)[1].lower() not in IMAGE_EXTENSIONS:
+            return
+
+        truth = load_labels(self.labels_dir, source)
+        if truth is None:
+            return
+
+        self.labelled += 1
+        predicted = {d["class_id"] for d in detections if d["score"] > self.threshold}
+        for class_id, counts in self.counts.items():
+            if class_id in predicted and class_id in truth:
+                counts["tp"] += 1
+            elif class_id in predicted:
+                counts["fp"] += 1
+            elif class_id in truth:
+                counts["fn"] += 1
+
+    def summary(self, elapsed):
+        """Özet istatistikleri döndür"""
+        latencies = sorted(self.latencies)
+        summary = {
+            "frames": self.frames,
+            "elapsed_seconds": round(elapsed, 2),
+            "throughput_fps": round(self.frames / elapsed, 2) if elapsed > 0 else 0.0,
+            "latency_ms": {
+                "p50": round(percentile(latencies, 0.50), 2),
+                "p95": round(percentile(latencies, 0.95), 2),
+                "p99": round(percentile(latencies, 0.99), 2),
+                "max": round(latencies[-1], 2) if latencies else 0.0
+            }
+        }
+
+        if self.labelled:
+            summary["labelled_images"] = self.labelled
+            summary["threshold"] = self.threshold
+            summary["classes"] = {}
+            for class_id, counts in self.counts.items():
+                tp, fp, fn = counts["tp"], counts["fp"], counts["fn"]
+                summary["classes"][self.class_names[class_id]] = {
+                    **counts,
+                    "precision": round(tp / (tp + fp), 4) if tp + fp else None,
+                    "recall": round(tp / (tp + fn), 4) if tp + fn else None
+                }
+
+        return summary
+
+
+def run_batch(sources, output_path, labels_dir=None, workers=None, frame_step=1, threshold=None, min_score=0.1):
+    """Kaynakları paralel çöz, toplu çıkarım yap, sonuçları yaz ve özeti döndür"""
+    try:
+        import degirum as dg
+    except ImportError:
+        logger.error("DeGirum API yüklenemedi. Lütfen 'pip install degirum' komutunu çalıştırın.")
+        sys.exit(1)
+
+    threshold = CONFIG["detection_threshold"] if threshold is None else threshold
+    workers = workers or os.cpu_count() or 1
+
+    model = dg.load_model(
+        model_name=MODEL_CONFIG['model_name'],
+        inference_host_address=MODEL_CONFIG['inference_host_address'],
+        zoo_url=MODEL_CONFIG['zoo_url'],
+        token=MODEL_CONFIG['token']
+    )
+    # Kareler OpenCV'den BGR olarak gelir; renk dönüşümünü modele bırak
+    model.input_numpy_colorspace = "BGR"
+
+    # Kod çözme süreçleri; sınırlı kuyruk bellek kullanımını sabit tutar.
+    # DeGirum istemcisi iş parçacıkları ve soketler açtığından süreçler fork yerine spawn ile başlatılır
+    context = mp.get_context("spawn")
+    task_queue = context.Queue()
+    frame_queue = context.Queue(maxsize=workers * 8)
+    for source in sources:
+        task_queue.put(source)
+    for _ in range(workers):
+        task_queue.put(None)
+
+    processes = [context.Process(target=decode_worker, args=(task_queue, frame_queue, frame_step), daemon=True)
+                 for _ in range(workers)]
+    for process in processes:
+        process.start()
+
+    submit_times = {}
+
+    def frames():
+        """Çözülen kareleri modele (veri, bilgi) çiftleri olarak ver"""
+        finished = 0
+        while finished < workers:
+            try:
+                item = frame_queue.get(timeout=1)
+            except queue.Empty:
+                # Bitiş işareti gönderemeden sonlanan (ör. bellek yetersizliğinden öldürülen) süreçler
+                if not any(process.is_alive() for process in processes) and frame_queue.empty():
+                    logger.error("Kod çözme süreçleri beklenmedik şekilde sonlandı (çıkış kodları: %s)",
+                                 [process.exitcode for process in processes])
+                    break
+                continue
+            if item is None:
+                finished += 1
+                continue
+            source, frame_index, original_size, frame = item
+            key = (source, frame_index)
+            submit_times[key] = time.monotonic()
+            yield frame, (source, frame_index, original_size)
+
+    evaluator = BatchEvaluator(MODEL_CONFIG['class_names'], threshold, labels_dir)
+    start_time = time.monotonic()
+
+    with gzip.open(output_path, "wt", encoding="utf-8") as output:
+        for result in model.predict_batch(frames()):
+            source, frame_index, original_size = result.info
+            latency = (time.monotonic() - submit_times.pop((source, frame_index))) * 1000
+
+            detections = parse_detections(result, original_size, min(min_score, threshold), INPUT_SIZE)
+            evaluator.add(source, detections, latency)
+
+            # Kısa anahtarlı tek satırlık kayıt: kaynak, kare, gecikme, [sınıf, skor, x1, y1, x2, y2]
+            output.write(json.dumps({
+                "s": source,
+                "f": frame_index,
+                "t": round(latency, 2),
+                "d": [[d["class_id"], round(d["score"], 4)] + d["box"] for d in detections]
+            }, separators=(",", ":")) + "\n")
+
+            if evaluator.frames % 500 == 0:
+                logger.info("%d kare işlendi", evaluator.frames)
+
+    for process in processes:
+        process.join()
+
+    return evaluator.summary(time.monotonic() - start_time)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Kayıtlı görüntü ve videolar üzerinde çevrimdışı yangın/duman tespiti")
+    parser.add_argument("inputs", nargs="+", help="Video/görüntü dosyaları veya dizinleri")
+    parser.add_argument("--output", default="batch_detections.jsonl.gz", help="Kare bazlı tespit çıktı dosyası")
+    parser.add_argument("--labels", help="YOLO biçiminde etiket dizini (görüntü adı.txt)")
+    parser.add_argument("--workers", type=int, default=None, help="Kod çözme süreç sayısı (varsayılan: CPU sayısı)")
+    parser.add_argument("--frame-step", type=int, default=1, help="Videolarda her N karede bir işle")
+    parser.add_argument("--threshold", type=float, default=None, help="Değerlendirme eşiği (varsayılan: config)")
+    parser.add_argument("--min-score", type=float, default=0.1, help="Çıktı dosyasına yazılacak en düşük skor")
+    args = parser.parse_args()
+
+    setup_logging()
+
+    sources = collect_sources(args.inputs)
+    if not sources:
+        logger.error("İşlenecek görüntü veya video bulunamadı")
+        sys.exit(1)
+
+    logger.info("%d kaynak işlenecek", len(sources))
+    summary = run_batch(sources, args.output, args.labels, args.workers, max(1, args.frame_step),
+                        args.threshold, args.min_score)
+
+    logger.info("Toplu işlem tamamlandı: %s", args.output)
+    print(json.dumps(summary, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Ön işleme yolu için bellek ayırma ve süre karşılaştırması (model gerektirmez).
+Her iki yol da aynı şekilde ölçülür: tracemalloc anlık görüntülerinde her kareden
+önce ve sonra --min-block boyutunun üstündeki canlı bloklar sayılır.
+
+Kullanım:
+    python benchmark.py --width 3840 --height 2160 --frames 200
+"""
+
+import os
+import time
+import argparse
+import tempfile
+import tracemalloc
+
+import cv2
+import numpy as np
+
+from preprocess import FrameBufferPool, Preprocessor
+
+
+class NaivePath:
+    """
+    Eski yol: cap.read() her karede yeni dizi ayırır, kare 640x640'a küçültülür,
+    geçici JPEG dosyasına yazılır ve model dosyayı yeniden okur; çizim için tam çözünürlüklü kopya alınır
+    """
+
+    def step(self, source):
+        frame = source.copy()  # cap.read() her çağrıda yeni dizi ayırıyordu
+        resized = cv2.resize(frame, (640, 640))
+
+        with tempfile.NamedTemporaryFile(suffix=".jpg", delete=False) as tmp:
+            temp_path = tmp.name
+        cv2.imwrite(temp_path, resized, [cv2.IMWRITE_JPEG_QUALITY, 95])
+        model_input = cv2.imread(temp_path)  # self.model(temp_path) dosyayı çözüyordu
+        os.unlink(temp_path)
+
+        processed = frame.copy()
+        return frame, resized, model_input, processed
+
+    def release(self, outputs):
+        pass
+
+
+class PreallocatedPath:
+    """Yeni yol: havuzdan yakalama tamponu, sabit model giriş tamponu ve çizim için tam çözünürlüklü kopya"""
+
+    def __init__(self, letterbox):
+        self.pool = FrameBufferPool()
+        self.preprocessor = Preprocessor(letterbox=letterbox)
+
+    def step(self, source):
+        buffer = self.pool.acquire()
+        if buffer is None:
+            frame = source.copy()
+            self.pool.adopt(frame, buffer)
+        else:
+            np.copyto(buffer, source)  # cap.read(image=buffer) yerine
+            frame = buffer
+
+        model_input = self.preprocessor.prepare(frame)
+        processed = frame.copy()
+        return frame, model_input, processed
+
+    def release(self, outputs):
+        self.pool.release(outputs[0])
+
+
+def count_blocks(min_block):
+    """tracemalloc ile izlenen, min_block bayttan büyük canlı blok sayısı"""
+    return sum(1 for trace in tracemalloc.take_snapshot().traces if trace.size >= min_block)
+
+
+def measure(name, create_path, source, frames, min_block):
+    """
+    Yolun kare başına süresini, tepe belleğini ve büyük blok ayırma sayısını ölç.
+    Kare çıktıları ölçüm süresince tutulur; kare sonundaki ve başındaki büyük blok sayılarının farkı
+    o karede ayrılan büyük dizilerdir. Havuzdan yeniden kullanılan tamponlar yeni blok sayılmaz.
+    """
+    tracemalloc.start()
+
+    baseline = count_blocks(min_block)
+    path = create_path()
+    setup_allocations = count_blocks(min_block) - baseline
+
+    frame_allocations = 0
+    elapsed = 0.0
+    for _ in range(frames):
+        before = count_blocks(min_block)
+
+        start_time = time.perf_counter()
+        outputs = path.step(source)
+        elapsed += time.perf_counter() - start_time
+
+        frame_allocations += count_blocks(min_block) - before
+        path.release(outputs)
+        del outputs
+
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{name:<26} {elapsed * 1000 / frames:8.2f} ms/kare   tepe bellek: {peak / 1e6:8.1f} MB   "
+          f"büyük blok ayırma: {setup_allocations + frame_allocations:5d} "
+          f"(kurulum {setup_allocations}, kare başına {frame_allocations / frames:.2f})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ön işleme bellek ayırma karşılaştırması")
+    parser.add_argument("--width", type=int, default=3840)
+    parser.add_argument("--height", type=int, default=2160)
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--letterbox", action="store_true")
+    parser.add_argument("--min-block", type=int, default=64 * 1024, help="Sayılacak en küçük blok boyutu (bayt)")
+    args = parser.parse_args()
+
+    source = np.random.randint(0, 255, (args.height, args.width, 3), dtype=np.uint8)
+    print(f"{args.frames} kare, {args.width}x{args.height}")
+
+    measure("Eski (kopya + geçici JPEG)", NaivePath, source, args.frames, args.min_block)
+    measure("Önceden ayrılmış", lambda: PreallocatedPath(args.letterbox), source, args.frames, args.min_block)
+
+
+if __name__ == "__main__":
+    main()
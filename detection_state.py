@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+İş parçacığı güvenli, sürümlü tespit durumu ve değişmez anlık görüntüleri
+"""
+
+import json
+import time
+import threading
+from datetime import datetime
+
+
+def _wall_time(monotonic_time, now_monotonic, now_wall):
+    """Monotonik zamanı duvar saati zamanına (epoch) çevir"""
+    if monotonic_time is None:
+        return None
+    return now_wall - (now_monotonic - monotonic_time)
+
+
+def _iso(epoch):
+    """Epoch zamanını ISO biçimine çevir"""
+    return datetime.fromtimestamp(epoch).isoformat() if epoch is not None else None
+
+
+class DetectionSnapshot:
+    """
+    Tespit durumunun belirli bir sürümdeki değişmez görüntüsü.
+    Serileştirilmiş biçimler (sözlük, JSON, sink'e özel yükler) sürüm başına bir kez üretilir.
+    """
+
+    __slots__ = ("version", "fire_detected", "smoke_detected", "fire_confidence", "smoke_confidence",
+                 "detection_count", "last_fire_time", "last_smoke_time", "last_updated", "_cache")
+
+    def __init__(self, version, fire_detected, smoke_detected, fire_confidence, smoke_confidence,
+                 detection_count, last_fire_time, last_smoke_time, last_updated):
+        set_field = object.__setattr__
+        set_field(self, "version", version)
+        set_field(self, "fire_detected", fire_detected)
+        set_field(self, "smoke_detected", smoke_detected)
+        set_field(self, "fire_confidence", fire_confidence)
+        set_field(self, "smoke_confidence", smoke_confidence)
+        set_field(self, "detection_count", detection_count)
+        set_field(self, "last_fire_time", last_fire_time)  # Duvar saati (epoch) ya da None
+        set_field(self, "last_smoke_time", last_smoke_time)
+        set_field(self, "last_updated", last_updated)
+        set_field(self, "_cache", {})
+
+    def __setattr__(self, name, value):
+        raise AttributeError("DetectionSnapshot değiştirilemez")
+
+    @property
+    def active(self):
+        """Ateş ya da duman tespit ediliyor mu"""
+        return self.fire_detected or self.smoke_detected
+
+    @property
+    def state(self):
+        """ON/OFF durumu"""
+        return "ON" if self.active else "OFF"
+
+    def cached(self, name, builder):
+        """builder(snapshot) sonucunu bu sürüm için önbelleğe al ve döndür"""
+        cache = self._cache
+        if name not in cache:
+            # Aynı anda iki okuyucu üretirse sonuç aynıdır; kilit gerekmez
+            cache[name] = builder(self)
+        return cache[name]
+
+    def as_dict(self):
+        """Sözlük biçimi (önbellekli; salt okunur kullanılmalıdır)"""
+        return self.cached("dict", lambda s: {
+            "fire_detected": s.fire_detected,
+            "smoke_detected": s.smoke_detected,
+            "last_fire_time": _iso(s.last_fire_time),
+            "last_smoke_time": _iso(s.last_smoke_time),
+            "detection_count": s.detection_count,
+            "fire_confidence": s.fire_confidence,
+            "smoke_confidence": s.smoke_confidence,
+            "state": s.state,
+            "last_updated": _iso(s.last_updated),
+            "version": s.version
+        })
+
+    def to_json(self):
+        """JSON biçimi (önbellekli)"""
+        return self.cached("json", lambda s: json.dumps(s.as_dict()))
+
+
+class DetectionState:
+    """
+    Yazıcılar (işleme ve durum iş parçacıkları) kilit altında günceller;
+    okuyucular her zaman tutarlı, değişmez bir DetectionSnapshot alır.
+    Zaman aşımı hesapları monotonik saatle yapılır.
+    """
+
+    __slots__ = ("lock", "version", "fire_detected", "smoke_detected", "fire_confidence", "smoke_confidence",
+                 "detection_count", "last_fire_mono", "last_smoke_mono", "last_updated_mono", "_snapshot")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.version = 0
+        self.fire_detected = False
+        self.smoke_detected = False
+        self.fire_confidence = 0.0
+        self.smoke_confidence = 0.0
+        self.detection_count = 0
+        self.last_fire_mono = None
+        self.last_smoke_mono = None
+        self.last_updated_mono = time.monotonic()
+        self._snapshot = None
+
+    def _changed(self, now):
+        """Sürümü artır ve önbellekli anlık görüntüyü geçersiz kıl (kilit tutulurken çağrılır)"""
+        self.version += 1
+        self.last_updated_mono = now
+        self._snapshot = None
+
+    def _build_snapshot(self):
+        """Geçerli sürüm için anlık görüntü oluştur (kilit tutulurken çağrılır)"""
+        if self._snapshot is None:
+            now_monotonic, now_wall = time.monotonic(), time.time()
+            self._snapshot = DetectionSnapshot(
+                self.version,
+                self.fire_detected,
+                self.smoke_detected,
+                self.fire_confidence,
+                self.smoke_confidence,
+                self.detection_count,
+                _wall_time(self.last_fire_mono, now_monotonic, now_wall),
+                _wall_time(self.last_smoke_mono, now_monotonic, now_wall),
+                _wall_time(self.last_updated_mono, now_monotonic, now_wall)
+            )
+        return self._snapshot
+
+    def record(self, fire_confidence=0.0, smoke_confidence=0.0, now=None):
+        """Bir karenin tespit sonucunu işle (0 güven = tespit yok) ve anlık görüntüyü döndür"""
+        now = time.monotonic() if now is None else now
+
+        with self.lock:
+            if not fire_confidence and not smoke_confidence:
+                return self._build_snapshot()
+
+            if fire_confidence:
+                self.fire_detected = True
+                self.fire_confidence = fire_confidence
+                self.last_fire_mono = now
+
+            if smoke_confidence:
+                self.smoke_detected = True
+                self.smoke_confidence = smoke_confidence
+                self.last_smoke_mono = now
+
+            self.detection_count += 1
+            self._changed(now)
+            return self._build_snapshot()
+
+    def expire(self, timeout, now=None):
+        """timeout saniye boyunca yeni tespit yoksa durumu sıfırla ve anlık görüntüyü döndür"""
+        now = time.monotonic() if now is None else now
+
+        with self.lock:
+            changed = False
+
+            if self.fire_detected and now - self.last_fire_mono > timeout:
+                self.fire_detected = False
+                self.fire_confidence = 0.0
+                changed = True
+
+            if self.smoke_detected and now - self.last_smoke_mono > timeout:
+                self.smoke_detected = False
+                self.smoke_confidence = 0.0
+                changed = True
+
+            if changed:
+                self._changed(now)
+            return self._build_snapshot()
+
+    def snapshot(self):
+        """Geçerli sürümün değişmez anlık görüntüsü"""
+        with self.lock:
+            return self._build_snapshot()
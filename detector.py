@@ -8,16 +8,22 @@ import cv2
 import time
 import sys
 import logging
-import threading
 import queue
-import tempfile
-from datetime import datetime
 import numpy as np
 
-from config import CONFIG, MODEL_CONFIG, RTSP_URL, HOME_ASSISTANT_CONFIG, MQTT_CONFIG
-from utils import draw_detections, save_detection_image
+from config import CONFIG, MODEL_CONFIG, RTSP_URL, INFERENCE_POOL_CONFIG, LIVE_VIEW_CONFIG, SUPERVISOR_CONFIG, SCHEDULER_CONFIG
+from utils import draw_detections, parse_detections
+from inference_pool import InferencePool, InferenceWorker
 from mqtt_manager import MQTTManager
 from home_assistant import HomeAssistantManager
+from live_view import FrameBroadcaster, LiveViewServer
+from metrics import Metrics
+from event_bus import EventBus
+from sinks import create_sinks
+from preprocess import FrameBufferPool, Preprocessor
+from supervisor import Supervisor
+from scheduler import ScanConfirmScheduler
+from detection_state import DetectionState
 
 # Loglama
 logger = logging.getLogger("hailo_fire_smoke_detection.detector")
@@ -35,22 +41,37 @@ class FireSmokeDetector:
         self.result_queue = queue.Queue()
         self.running = False
         self.frame_count = 0
+        self.capture_sequence = 0  # Yeniden bağlanmalarda da artan kare sıra numarası
         self.detection_count = 0
         self.last_alert_time = time.time() - 100  # Başlangıçta hemen uyarı vermek için
         self.last_mqtt_update_time = time.time() - 100  # MQTT güncellemesi için
         
-        # Tespit durumu
-        self.current_detections = {
-            "fire_detected": False,
-            "smoke_detected": False,
-            "last_fire_time": None,
-            "last_smoke_time": None,
-            "detection_count": 0,
-            "fire_confidence": 0.0,
-            "smoke_confidence": 0.0,
-            "state": "OFF",
-            "last_updated": datetime.now().isoformat()
-        }
+        # Performans metrikleri (gecikme, atılan kareler vb.)
+        self.metrics = Metrics()
+        
+        # Yakalanan kareler için yeniden kullanılan tamponlar
+        self.frame_pool = FrameBufferPool()
+        
+        # Tarama/doğrulama zamanlaması (devre dışıysa sabit frame_skip kullanılır)
+        self.scheduler = None
+        if SCHEDULER_CONFIG["enabled"]:
+            self.scheduler = ScanConfirmScheduler(
+                patrol_fps=SCHEDULER_CONFIG["patrol_fps"],
+                burst_fps=SCHEDULER_CONFIG["burst_fps"],
+                budget_fps=SCHEDULER_CONFIG["budget_fps"],
+                burst_seconds=SCHEDULER_CONFIG["burst_seconds"],
+                burst_cooldown=SCHEDULER_CONFIG["burst_cooldown"],
+                patrol_threshold=SCHEDULER_CONFIG["patrol_threshold"],
+                detection_threshold=CONFIG["detection_threshold"],
+                metrics=self.metrics
+            )
+            self.scheduler.register(CONFIG["camera_name"])
+        
+        # Çıkış hedeflerine (MQTT, Home Assistant, disk, webhook, log) olay yolu
+        self.event_bus = EventBus()
+        
+        # Tespit durumu (sürümlü; okuyucular değişmez anlık görüntü alır)
+        self.detection_state = DetectionState()
         
         # Son işlenmiş kare
         self.last_processed_frame = None
@@ -59,249 +80,252 @@ class FireSmokeDetector:
         self.mqtt_manager = MQTTManager()
         self.ha_manager = HomeAssistantManager()
         
+        # Canlı görüntü yayını (HTTP/MJPEG)
+        self.broadcaster = FrameBroadcaster(jpeg_quality=LIVE_VIEW_CONFIG["jpeg_quality"])
+        self.live_view_server = LiveViewServer(self.broadcaster) if LIVE_VIEW_CONFIG["enabled"] else None
+        
         # DeGirum modeli yükle
         self.load_model()
         
-        # İş parçacıkları
-        self.capture_thread_obj = None
-        self.processing_thread_obj = None
-        self.display_thread_obj = None
-        self.home_assistant_thread_obj = None
-        self.mqtt_thread_obj = None
+        # Aşama denetleyicisi (kalp atışı, yerinde yeniden başlatma)
+        self.supervisor = Supervisor(
+            self.metrics,
+            backoff_base=SUPERVISOR_CONFIG["backoff_base"],
+            backoff_max=SUPERVISOR_CONFIG["backoff_max"]
+        )
     
     def load_model(self):
-        """DeGirum Hailo 8 modelini yükle"""
-        try:
-            logger.info(f"Model yükleniyor: {MODEL_CONFIG['model_name']}")
-            
-            # Modeli yükle
-            self.model = dg.load_model(
-                model_name=MODEL_CONFIG['model_name'],
-                inference_host_address=MODEL_CONFIG['inference_host_address'],
-                zoo_url=MODEL_CONFIG['zoo_url'],
-                token=MODEL_CONFIG['token']
-            )
+        """DeGirum Hailo 8 modelini her çıkarım işçisi için yükle ve havuzu oluştur"""
+        workers = []
+        
+        for index, worker_config in enumerate(INFERENCE_POOL_CONFIG["workers"]):
+            host = worker_config.get("inference_host_address", MODEL_CONFIG['inference_host_address'])
+            devices = worker_config.get("devices_selected")
+            name = f"{host}#{index}" if devices is None else f"{host}{devices}"
             
-            logger.info(f"Model başarıyla yüklendi.")
-        except Exception as e:
-            logger.error(f"Model yükleme hatası: {str(e)}")
+            try:
+                logger.info(f"Model yükleniyor: {MODEL_CONFIG['model_name']} ({name})")
+                
+                # Modeli yükle
+                model = dg.load_model(
+                    model_name=MODEL_CONFIG['model_name'],
+                    inference_host_address=host,
+                    zoo_url=MODEL_CONFIG['zoo_url'],
+                    token=MODEL_CONFIG['token']
+                )
+                
+                # Yerel çoklu cihaz kurulumunda işçiyi belirli cihazlara bağla
+                if devices is not None:
+                    model.devices_selected = list(devices)
+                
+                # Kareler OpenCV'den BGR olarak gelir; renk dönüşümü ve normalizasyon modelde yapılır
+                model.input_numpy_colorspace = "BGR"
+                
+                workers.append(InferenceWorker(name, model))
+                logger.info(f"Model başarıyla yüklendi ({name}).")
+            except Exception as e:
+                logger.error(f"Model yükleme hatası ({name}): {str(e)}")
+        
+        if not workers:
+            logger.error("Hiçbir çıkarım işçisi yüklenemedi")
             sys.exit(1)
+        
+        self.model = InferencePool(
+            workers,
+            max_failures=INFERENCE_POOL_CONFIG["max_failures"],
+            slow_latency=INFERENCE_POOL_CONFIG["slow_latency"],
+            eject_seconds=INFERENCE_POOL_CONFIG["eject_seconds"]
+        )
     
-    def process_frame(self, frame):
-        """Tek bir kareyi işle ve sonuçları döndür"""
+    def process_frame(self, frame, capture_time=None, preprocessor=None):
+        """
+        Tek bir kareyi işle ve sonuçları döndür.
+        capture_time: time.monotonic() cinsinden yakalama zamanı
+        preprocessor: iş parçacığına ait önceden ayrılmış giriş tamponu
+        """
         try:
             # Preprocessing ve çıkarım başlangıcı
             start_time = time.time()
             original_size = (frame.shape[0], frame.shape[1])
             
-            # Modelin istediği boyuta (640x640) yeniden boyutlandır
-            resized_frame = cv2.resize(frame, (640, 640))
+            # Modelin istediği boyuta (640x640) sabit tampona yeniden boyutlandır
+            if preprocessor is None:
+                preprocessor = Preprocessor(letterbox=CONFIG["letterbox"])
+            model_input = preprocessor.prepare(frame)
             
-            # Geçici dosyaya kaydet
-            with tempfile.NamedTemporaryFile(suffix='.jpg', delete=False) as tmp:
-                temp_path = tmp.name
-            
-            # Görüntüyü yüksek kalitede kaydet
-            cv2.imwrite(temp_path, resized_frame, [cv2.IMWRITE_JPEG_QUALITY, 95])
-            
-            # Çıkarım - direk modeli fonksiyon olarak çağır
-            result = self.model(temp_path)
-            
-            # Geçici dosyayı temizle
-            try:
-                os.unlink(temp_path)
-            except:
-                pass
+            # Çıkarım - havuzdaki en uygun işçiye gönder
+            result = self.model.predict(model_input)
                 
             inference_time = time.time() - start_time
             
-            # Tespit durumlarını güncelle
-            fire_detected = False
-            smoke_detected = False
-            fire_confidence = 0.0
-            smoke_confidence = 0.0
-            
-            detections = []
+            # İşleme sonuçları; zamanlama açıksa devriye eşiğinin üstündeki adaylar da alınır
+            parse_threshold = CONFIG["detection_threshold"]
+            if self.scheduler is not None:
+                parse_threshold = min(parse_threshold, SCHEDULER_CONFIG["patrol_threshold"])
             
-            # İşleme sonuçları
-            if hasattr(result, 'results') and isinstance(result.results, list):
-                logger.debug(f"Tespit sonuçları: {len(result.results)}")
-                
-                for detection in result.results:
-                    # 'bbox' alanını kontrol et
-                    if 'bbox' in detection:
-                        bbox = detection['bbox']
-                        if len(bbox) == 4:
-                            # Normalize coordinates from the model (640x640) to original frame size
-                            x1, y1, x2, y2 = map(float, bbox)
-                            
-                            # Model normalize koordinat veriyorsa (0-1 arası) orijinal boyuta dönüştür
-                            if x1 <= 1.0 and y1 <= 1.0 and x2 <= 1.0 and y2 <= 1.0:
-                                x1 = int(x1 * original_size[1])
-                                y1 = int(y1 * original_size[0])
-                                x2 = int(x2 * original_size[1])
-                                y2 = int(y2 * original_size[0])
-                            else:
-                                # 640x640 koordinatlarını orijinal boyuta ölçekle
-                                x1 = int(x1 * original_size[1] / 640)
-                                y1 = int(y1 * original_size[0] / 640)
-                                x2 = int(x2 * original_size[1] / 640)
-                                y2 = int(y2 * original_size[0] / 640)
-                            
-                            # Sınıf kimliğini ve skoru al
-                            class_id = detection.get('class_id', 0)
-                            score = detection.get('score', 0)
-                            class_name = detection.get('class_name', '')
-                            
-                            if score > CONFIG["detection_threshold"]:
-                                # DeGirum class_name değerini doğrudan döndürür
-                                if class_name == "fire":
-                                    fire_detected = True
-                                    fire_confidence = max(fire_confidence, score)
-                                elif class_name == "smoke":
-                                    smoke_detected = True  
-                                    smoke_confidence = max(smoke_confidence, score)
-                                
-                                detections.append({
-                                    "box": [x1, y1, x2, y2],
-                                    "score": float(score),
-                                    "class_id": int(class_id),
-                                    "class_name": class_name
-                                })
+            candidates = parse_detections(result, original_size, parse_threshold,
+                                          letterbox=preprocessor.geometry if preprocessor.letterbox else None)
+            detections = [d for d in candidates if d["score"] > CONFIG["detection_threshold"]]
             
-            # Tespit durumunu güncelle
-            now = datetime.now().isoformat()
+            # En yüksek aday skoruna göre devriye/doğrulama modunu güncelle
+            if self.scheduler is not None:
+                self.scheduler.report(CONFIG["camera_name"], max((d["score"] for d in candidates), default=0.0))
             
-            # Tespit durumunu güncelle
-            if fire_detected:
-                self.current_detections["fire_detected"] = True
-                self.current_detections["last_fire_time"] = now
-                self.current_detections["fire_confidence"] = fire_confidence
-                
-            if smoke_detected:
-                self.current_detections["smoke_detected"] = True
-                self.current_detections["last_smoke_time"] = now
-                self.current_detections["smoke_confidence"] = smoke_confidence
-                
-            if fire_detected or smoke_detected:
-                self.current_detections["detection_count"] += 1
-                self.current_detections["state"] = "ON"
+            # Tespit durumlarını güncelle
+            fire_confidence = max((d["score"] for d in detections if d["class_name"] == "fire"), default=0.0)
+            smoke_confidence = max((d["score"] for d in detections if d["class_name"] == "smoke"), default=0.0)
+            snapshot = self.detection_state.record(fire_confidence, smoke_confidence)
             
-            # Sonuçları kaydet
+            # Sonuçları çiz
             processed_frame = frame.copy()
             if detections:
                 processed_frame = draw_detections(processed_frame, detections, MODEL_CONFIG['class_names'])
+            
+            # FPS hesapla (kare sink'lere verilmeden önce çizilir; sonrasında değiştirilmez)
+            fps = 1.0 / inference_time
+            cv2.putText(processed_frame, f"FPS: {fps:.2f}", (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 0), 2)
+            cv2.putText(processed_frame, f"FPS: {fps:.2f}", (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 1)
+            
+            if detections:
                 self.detection_count += 1
                 
                 # Son işlenmiş kareyi kaydet
-                self.last_processed_frame = processed_frame.copy()
+                self.last_processed_frame = processed_frame
                 
-                # Tespiti kaydet
-                save_detection_image(processed_frame)
-                
-                # Uyarı ver
+                # Olayı bir kez yayınla; sink'ler kendi kuyruklarından tüketir
+                event_type = "detection"
                 if CONFIG["alert_mode"] and time.time() - self.last_alert_time > 10:  # Her 10 saniyede bir uyarı
                     self.last_alert_time = time.time()
-                    logger.warning(f"UYARI: {len(detections)} yangın/duman tespit edildi!")
-                    
-                    # Home Assistant'ı güncelle
-                    self.ha_manager.update_sensor(self.current_detections)
-                    
-                    # MQTT'yi güncelle ve resmi gönder
-                    self.mqtt_manager.update_state(self.current_detections, processed_frame)
-                else:
-                    # Normal MQTT güncellemesi
-                    self.mqtt_manager.update_state(self.current_detections)
-            else:
-                # Tespit yoksa da MQTT'yi güncelle
-                self.mqtt_manager.update_state(self.current_detections)
-            
-            # FPS hesapla
-            fps = 1.0 / inference_time
-            cv2.putText(processed_frame, f"FPS: {fps:.2f}", (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 0), 2)
-            cv2.putText(processed_frame, f"FPS: {fps:.2f}", (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 1)
-            
-            self.current_detections["last_updated"] = now
+                    event_type = "alert"
+                
+                self.event_bus.emit(event_type, {
+                    "state": snapshot,
+                    "frame": processed_frame,
+                    "detections": detections,
+                    "capture_time": capture_time
+                })
             
             return processed_frame, detections, fps
             
         except Exception as e:
-            logger.error(f"Kare işleme hatası: {str(e)}")
-            import traceback
-            logger.error(traceback.format_exc())
-            return frame, [], 0
+            # Traceback biçimlendirmesi arka plandaki log iş parçacığında yapılır
+            logger.error("Kare işleme hatası: %s", e, exc_info=True)
+            # Yakalama tamponu havuza döneceği için kopyası döndürülür
+            return frame.copy(), [], 0
     
-    def capture_thread(self):
-        """RTSP akışından video yakala"""
+    def capture_thread(self, ctx):
+        """
+        RTSP akışından video yakala.
+        Akış açılamaz ya da kare okunamazsa aşama sonlanır; denetleyici akışı
+        üstel geri çekilme ile yeniden açar.
+        """
         logger.info(f"RTSP URL bağlantısı başlatılıyor: {RTSP_URL}")
+        ctx.heartbeat()
         cap = cv2.VideoCapture(RTSP_URL)
         
         if not cap.isOpened():
             logger.error(f"RTSP akışı açılamadı: {RTSP_URL}")
-            self.running = False
             return
         
         logger.info("Video yakalama başladı")
         
-        frame_count = 0
-        while self.running:
-            ret, frame = cap.read()
-            if not ret:
-                logger.warning("Kare yakalanamadı, yeniden bağlanmaya çalışılıyor...")
-                time.sleep(1)
-                cap = cv2.VideoCapture(RTSP_URL)
-                continue
-            
-            frame_count += 1
-            # Performans için kare atlama
-            if frame_count % CONFIG["frame_skip"] != 0:
-                continue
+        try:
+            while ctx.running:
+                self.capture_sequence += 1
+                
+                # Performans için kare atlama (sabit frame_skip ya da tarama/doğrulama zamanlaması);
+                # atlanan karelerde yalnızca grab() (kopya/ayırma yok)
+                if self.scheduler is not None:
+                    skip = not self.scheduler.admit(CONFIG["camera_name"])
+                else:
+                    skip = self.capture_sequence % CONFIG["frame_skip"] != 0
+                
+                if skip:
+                    if not cap.grab():
+                        logger.warning("Kare yakalanamadı, akış yeniden açılacak")
+                        return
+                    ctx.heartbeat()
+                    continue
+                
+                # Havuzdaki boş bir tampona oku
+                buffer = self.frame_pool.acquire()
+                ret, frame = cap.read(image=buffer) if buffer is not None else cap.read()
+                capture_time = time.monotonic()
+                if not ret:
+                    self.frame_pool.release(buffer)
+                    logger.warning("Kare yakalanamadı, akış yeniden açılacak")
+                    return
+                self.frame_pool.adopt(frame, buffer)
+                
+                # Takılı kalan okuma sırasında aşama yeniden başlatıldıysa kareyi bırak ve çık
+                if not ctx.running:
+                    self.frame_pool.release(frame)
+                    break
+                ctx.heartbeat(progress=True)
+                    
+                # Kare kuyruğuna ekle, doluysa en eski kareyi at
+                if self.frame_queue.full():
+                    try:
+                        dropped_frame, _, _ = self.frame_queue.get_nowait()
+                        self.frame_pool.release(dropped_frame)
+                        self.metrics.inc("frames_dropped_queue_full")
+                    except queue.Empty:
+                        pass
                 
-            # Kare kuyruğuna ekle, doluysa en eski kareyi at
-            if self.frame_queue.full():
                 try:
-                    self.frame_queue.get_nowait()
-                except queue.Empty:
+                    # Kare, yakalama sıra numarası ve zamanı ile birlikte taşınır
+                    self.frame_queue.put((frame, self.capture_sequence, capture_time))
+                except:
                     pass
-            
-            try:
-                self.frame_queue.put(frame)
-            except:
-                pass
-        
-        cap.release()
-        logger.info("Video yakalama durduruldu")
+        finally:
+            cap.release()
+            logger.info("Video yakalama durduruldu")
     
-    def processing_thread(self):
+    def processing_thread(self, ctx):
         """Kare kuyruğundan alınan kareleri işle"""
         logger.info("İşleme başlatıldı")
         
-        while self.running:
+        # Bu iş parçacığına ait model giriş tamponu
+        preprocessor = Preprocessor(letterbox=CONFIG["letterbox"])
+        
+        while ctx.running:
+            ctx.heartbeat()
             try:
                 # Kuyruktaki bir sonraki kareyi al
-                frame = self.frame_queue.get(timeout=1)
+                frame, sequence, capture_time = self.frame_queue.get(timeout=1)
                 
-                # Kareyi işle
-                processed_frame, detections, fps = self.process_frame(frame)
+                # Gecikme bütçesini aşan bayat kareleri çıkarımdan önce at
+                frame_age = time.monotonic() - capture_time
+                if frame_age > CONFIG["max_frame_age"]:
+                    self.frame_pool.release(frame)
+                    self.metrics.inc("frames_dropped_stale")
+                    continue
+                self.metrics.observe("frame_age_at_inference_ms", frame_age * 1000)
+                
+                # Kareyi işle; işlenmiş kare ayrı bir kopya olduğundan yakalama tamponu havuza döner
+                processed_frame, detections, fps = self.process_frame(frame, capture_time, preprocessor)
+                self.frame_pool.release(frame)
                 
                 # Sonuç kuyruğuna ekle
-                self.result_queue.put((processed_frame, detections, fps))
+                self.result_queue.put((processed_frame, detections, fps, sequence, capture_time))
                 
                 self.frame_count += 1
+                ctx.heartbeat(progress=True)
                 
             except queue.Empty:
                 continue
             except Exception as e:
-                logger.error(f"İşleme hatası: {str(e)}")
+                logger.error("İşleme hatası: %s", e)
         
         logger.info("İşleme durduruldu")
     
-    def display_thread(self):
+    def display_thread(self, ctx):
         """İşlenen kareleri göster"""
         logger.info("Görüntüleme başlatıldı")
         
         last_log_time = time.time()
         frames_since_log = 0
+        last_sequence = 0  # Gösterilen son karenin yakalama sıra numarası
         
         try:
             # Görüntüleme penceresini oluşturmadan önce ekran kontrolü yap
@@ -313,10 +337,23 @@ class FireSmokeDetector:
             logger.warning(f"Ekran kontrolü başarısız: {str(e)}, görüntüleme devre dışı bırakılıyor")
             CONFIG["display_output"] = False
         
-        while self.running:
+        while ctx.running:
+            ctx.heartbeat()
             try:
                 # Sonuç kuyruğundan işlenmiş kareyi al
-                processed_frame, detections, fps = self.result_queue.get(timeout=1)
+                processed_frame, detections, fps, sequence, capture_time = self.result_queue.get(timeout=1)
+                ctx.heartbeat(progress=True)
+                
+                # Paralel işleme iş parçacıkları sonuçları sırasız verebilir; daha yeni bir
+                # kare gösterildiyse eskisini atla (görüntü ve canlı yayın geriye gitmesin)
+                if sequence <= last_sequence:
+                    self.metrics.inc("frames_dropped_out_of_order")
+                    continue
+                last_sequence = sequence
+                
+                # Canlı görüntü istemcilerine yayınla (kodlama istemci tarafında yapılır)
+                if self.live_view_server is not None:
+                    self.broadcaster.publish(processed_frame)
                 
                 # Kareyi göster
                 if CONFIG["display_output"]:
@@ -328,7 +365,7 @@ class FireSmokeDetector:
                             self.running = False
                             break
                     except Exception as e:
-                        logger.error(f"Görüntü gösterme hatası: {str(e)}")
+                        logger.error("Görüntü gösterme hatası: %s", e)
                         CONFIG["display_output"] = False
                         logger.warning("Görüntüleme devre dışı bırakıldı")
                 
@@ -337,14 +374,14 @@ class FireSmokeDetector:
                 # Her 10 saniyede bir istatistikleri günlüğe kaydet
                 if time.time() - last_log_time > 10:
                     fps_avg = frames_since_log / (time.time() - last_log_time)
-                    logger.info(f"İstatistikler - FPS: {fps_avg:.2f}, İşlenen kareler: {self.frame_count}, Tespitler: {self.detection_count}")
+                    logger.info("İstatistikler - FPS: %.2f, İşlenen kareler: %d, Tespitler: %d", fps_avg, self.frame_count, self.detection_count)
                     last_log_time = time.time()
                     frames_since_log = 0
                     
             except queue.Empty:
                 continue
             except Exception as e:
-                logger.error(f"Görüntüleme hatası: {str(e)}")
+                logger.error("Görüntüleme hatası: %s", e)
         
         # Görüntüleme penceresini kapat
         if CONFIG["display_output"]:
@@ -355,88 +392,34 @@ class FireSmokeDetector:
         
         logger.info("Görüntüleme durduruldu")
     
-    def home_assistant_thread(self):
-        """Home Assistant'ı periyodik olarak güncelle"""
-        logger.info("Home Assistant güncelleme iş parçacığı başlatıldı")
+    def state_thread(self, ctx):
+        """Tespit durumunu zaman aşımına göre sıfırla ve periyodik durum olayı yayınla"""
+        logger.info("Durum güncelleme iş parçacığı başlatıldı")
         
-        while self.running:
+        while ctx.running:
             try:
-                # Belirli aralıklarla Home Assistant'ı güncelle
-                time.sleep(HOME_ASSISTANT_CONFIG["update_interval"])
+                time.sleep(1)
+                ctx.heartbeat(progress=True)
                 
-                # Sadece tespit varsa güncelle (gereksiz API çağrılarını önlemek için)
-                if self.current_detections["fire_detected"] or self.current_detections["smoke_detected"]:
-                    self.ha_manager.update_sensor(self.current_detections)
-                    
                 # 30 saniye boyunca yeni tespit yoksa durumu sıfırla
-                if (self.current_detections["fire_detected"] and 
-                    self.current_detections["last_fire_time"] and
-                    (datetime.now() - datetime.fromisoformat(self.current_detections["last_fire_time"])).total_seconds() > 30):
-                    self.current_detections["fire_detected"] = False
-                    self.current_detections["fire_confidence"] = 0.0
-                    # Home Assistant'ı güncelle
-                    self.ha_manager.update_sensor(self.current_detections)
-                    
-                if (self.current_detections["smoke_detected"] and 
-                    self.current_detections["last_smoke_time"] and
-                    (datetime.now() - datetime.fromisoformat(self.current_detections["last_smoke_time"])).total_seconds() > 30):
-                    self.current_detections["smoke_detected"] = False
-                    self.current_detections["smoke_confidence"] = 0.0
-                    # Home Assistant'ı güncelle
-                    self.ha_manager.update_sensor(self.current_detections)
+                snapshot = self.detection_state.expire(30)
                 
-                # Her iki tespit de kapatıldıysa durumu değiştir
-                if not self.current_detections["fire_detected"] and not self.current_detections["smoke_detected"]:
-                    self.current_detections["state"] = "OFF"
-                    
-            except Exception as e:
-                logger.error(f"Home Assistant güncelleme hatası: {str(e)}")
-                
-        logger.info("Home Assistant güncelleme iş parçacığı durduruldu")
-    
-    def mqtt_thread(self):
-        """MQTT durumunu periyodik olarak güncelle"""
-        logger.info("MQTT güncelleme iş parçacığı başlatıldı")
-        
-        while self.running:
-            try:
-                # Belirli aralıklarla MQTT'yi güncelle
-                time.sleep(MQTT_CONFIG["update_interval"])
+                # Tampon havuzu, çıkarım işçileri ve zamanlama istatistikleri
+                self.metrics.set("frame_buffers", self.frame_pool.stats())
+                self.metrics.set("inference_pool", self.model.stats())
+                if self.scheduler is not None:
+                    self.metrics.set("scheduler", self.scheduler.stats())
                 
-                # Son işlenmiş kare varsa, durumla birlikte gönder
-                if self.last_processed_frame is not None:
-                    self.mqtt_manager.update_state(self.current_detections, self.last_processed_frame)
-                else:
-                    self.mqtt_manager.update_state(self.current_detections)
-                    
-                # 30 saniye boyunca yeni tespit yoksa durumu sıfırla
-                if (self.current_detections["fire_detected"] and 
-                    self.current_detections["last_fire_time"] and
-                    (datetime.now() - datetime.fromisoformat(self.current_detections["last_fire_time"])).total_seconds() > 30):
-                    self.current_detections["fire_detected"] = False
-                    self.current_detections["fire_confidence"] = 0.0
-                    # MQTT'yi güncelle
-                    self.mqtt_manager.update_state(self.current_detections, force=True)
-                    
-                if (self.current_detections["smoke_detected"] and 
-                    self.current_detections["last_smoke_time"] and
-                    (datetime.now() - datetime.fromisoformat(self.current_detections["last_smoke_time"])).total_seconds() > 30):
-                    self.current_detections["smoke_detected"] = False
-                    self.current_detections["smoke_confidence"] = 0.0
-                    # MQTT'yi güncelle
-                    self.mqtt_manager.update_state(self.current_detections, force=True)
-                
-                # Her iki tespit de kapatıldıysa durumu değiştir
-                if not self.current_detections["fire_detected"] and not self.current_detections["smoke_detected"]:
-                    self.current_detections["state"] = "OFF"
+                # Sink'ler kendi güncelleme aralıklarına göre yayınlar
+                self.event_bus.emit("state", {
+                    "state": snapshot,
+                    "frame": self.last_processed_frame
+                })
                     
             except Exception as e:
-                logger.error(f"MQTT güncelleme hatası: {str(e)}")
+                logger.error("Durum güncelleme hatası: %s", e)
                 
-        logger.info("MQTT güncelleme iş parçacığı durduruldu")
-        
-        # Çıkışta offline durumunu bildir
-        self.mqtt_manager.set_offline()
+        logger.info("Durum güncelleme iş parçacığı durduruldu")
         
     def start(self):
         """Tüm iş parçacıklarını başlat"""
@@ -444,64 +427,51 @@ class FireSmokeDetector:
         
         # MQTT bağlantısını kur
         mqtt_connected = self.mqtt_manager.connect()
-        
-        # İş parçacıklarını oluştur
-        self.capture_thread_obj = threading.Thread(target=self.capture_thread, name="capture")
-        self.processing_thread_obj = threading.Thread(target=self.processing_thread, name="processing")
-        self.display_thread_obj = threading.Thread(target=self.display_thread, name="display")
-        self.home_assistant_thread_obj = threading.Thread(target=self.home_assistant_thread, name="home_assistant")
-        
-        # MQTT iş parçacığını ekle
         if mqtt_connected:
-            self.mqtt_thread_obj = threading.Thread(target=self.mqtt_thread, name="mqtt")
             self.mqtt_manager.publish_initial_state()
-        else:
-            self.mqtt_thread_obj = None
         
-        # İş parçacıklarını başlat
-        self.capture_thread_obj.start()
-        self.processing_thread_obj.start()
-        self.display_thread_obj.start()
-        self.home_assistant_thread_obj.start()
+        # Sink'leri oluştur ve olay yolunu başlat
+        create_sinks(self.event_bus, self.metrics, self.mqtt_manager, self.ha_manager, mqtt_connected)
+        self.event_bus.start()
+        
+        # Canlı görüntü sunucusunu başlat
+        if self.live_view_server is not None:
+            self.live_view_server.start()
+        
+        # Aşamaları oluştur
+        stall_timeouts = SUPERVISOR_CONFIG["stall_timeouts"]
+        self.supervisor.add_stage("capture", self.capture_thread, stall_timeouts["capture"])
+        
+        # Havuzdaki işçileri meşgul tutacak kadar işleme aşaması oluştur
+        processing_threads = INFERENCE_POOL_CONFIG["processing_threads"] or len(self.model)
+        for i in range(processing_threads):
+            self.supervisor.add_stage(f"processing-{i}", self.processing_thread, stall_timeouts["processing"])
+        
+        self.supervisor.add_stage("display", self.display_thread, stall_timeouts["display"])
+        self.supervisor.add_stage("state", self.state_thread, stall_timeouts["state"])
         
-        # MQTT iş parçacığını başlat
-        if self.mqtt_thread_obj is not None:
-            self.mqtt_thread_obj.start()
+        # Aşamaları başlat
+        self.supervisor.start()
         
         logger.info("Tüm iş parçacıkları başlatıldı")
         
         try:
-            # Ana iş parçacığını çalışır durumda tut
+            # Ana iş parçacığı aşamaları denetler; çöken ya da takılan aşama yerinde yeniden başlatılır
             while self.running:
-                time.sleep(0.1)
-                
-                # Kullanıcı CTRL+C ile kesebilir
-                active_threads = [self.capture_thread_obj.is_alive(), 
-                                 self.processing_thread_obj.is_alive(),
-                                 self.display_thread_obj.is_alive(),
-                                 self.home_assistant_thread_obj.is_alive()]
-                
-                if self.mqtt_thread_obj is not None:
-                    active_threads.append(self.mqtt_thread_obj.is_alive())
-                
-                if not all(active_threads):
-                    logger.warning("Bir iş parçacığı durdu, kapatılıyor...")
-                    self.running = False
-                    break
+                time.sleep(SUPERVISOR_CONFIG["check_interval"])
+                self.supervisor.check()
                     
         except KeyboardInterrupt:
             logger.info("Kullanıcı tarafından durduruldu")
             self.running = False
         
-        # İş parçacıklarının bitmesini bekle
-        self.capture_thread_obj.join()
-        self.processing_thread_obj.join()
-        self.display_thread_obj.join()
-        self.home_assistant_thread_obj.join()
+        # Aşamaların bitmesini bekle
+        self.supervisor.stop(SUPERVISOR_CONFIG["shutdown_timeout"])
+        
+        # Bekleyen olayları işle ve sink'leri durdur (MQTT offline bildirimi dahil)
+        self.event_bus.stop()
         
-        # MQTT iş parçacığını bekle
-        if self.mqtt_thread_obj is not None:
-            self.mqtt_thread_obj.join()
+        if self.live_view_server is not None:
+            self.live_view_server.stop()
         
         logger.info("Uygulama durduruldu")
-
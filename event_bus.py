@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Tespit ve durum olaylarını çıkış hedeflerine (sink) dağıtan olay yolu
+"""
+
+import time
+import logging
+import threading
+from collections import deque
+
+# Loglama
+logger = logging.getLogger("hailo_fire_smoke_detection.event_bus")
+
+# Kuyruk dolduğunda uygulanacak politikalar
+DROP_OLDEST = "drop_oldest"
+DROP_NEWEST = "drop_newest"
+COALESCE = "coalesce"
+
+
+class Event:
+    """Yol üzerinde taşınan tek bir olay"""
+
+    __slots__ = ("type", "data", "created")
+
+    def __init__(self, event_type, data):
+        self.type = event_type
+        self.data = data
+        self.created = time.monotonic()
+
+
+class Sink:
+    """
+    Kendi sınırlı kuyruğu ve iş parçacığı olan çıkış hedefi.
+    Alt sınıflar event_types ve handle() tanımlar.
+    """
+
+    event_types = ()
+
+    def __init__(self, name, queue_size=32, policy=DROP_OLDEST):
+        if policy not in (DROP_OLDEST, DROP_NEWEST, COALESCE):
+            raise ValueError(f"Bilinmeyen kuyruk politikası: {policy}")
+
+        self.name = name
+        self.queue_size = queue_size
+        self.policy = policy
+        self.pending = deque()
+        self.condition = threading.Condition()
+        self.running = False
+        self.thread = None
+
+        # Metrikler
+        self.handled = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+
+    def handle(self, event):
+        """Olayı işle (alt sınıflar uygular)"""
+        raise NotImplementedError
+
+    def offer(self, event):
+        """Olayı engellemeden kuyruğa ekle; kuyruk doluysa politikaya göre davran"""
+        with self.condition:
+            if self.policy == COALESCE:
+                # Aynı türden bekleyen olayı en yenisiyle değiştir
+                for index, pending in enumerate(self.pending):
+                    if pending.type == event.type:
+                        self.pending[index] = event
+                        self.coalesced += 1
+                        return
+
+            if len(self.pending) >= self.queue_size:
+                self.dropped += 1
+                if self.policy == DROP_NEWEST:
+                    return
+                self.pending.popleft()
+
+            self.pending.append(event)
+            self.condition.notify()
+
+    def _run(self):
+        """Kuyruktaki olayları sırayla işle"""
+        while True:
+            with self.condition:
+                while self.running and not self.pending:
+                    self.condition.wait(1)
+                if not self.pending:
+                    break
+                event = self.pending.popleft()
+
+            lag = time.monotonic() - event.created
+            self.last_lag = lag
+            self.max_lag = max(self.max_lag, lag)
+
+            try:
+                self.handle(event)
+                self.handled += 1
+            except Exception as e:
+                self.errors += 1
+                logger.error("Sink hatası (%s): %s", self.name, e)
+
+    def start(self):
+        """Sink iş parçacığını başlat"""
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name=f"sink-{self.name}", daemon=True)
+        self.thread.start()
+
+    def stop(self, timeout=5.0):
+        """Bekleyen olayları işleyip iş parçacığını durdur"""
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+        if self.thread is not None:
+            self.thread.join(timeout)
+
+    def stats(self):
+        """Sink metrikleri"""
+        with self.condition:
+            queued = len(self.pending)
+        return {
+            "queued": queued,
+            "handled": self.handled,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "errors": self.errors,
+            "lag_ms": round(self.last_lag * 1000, 2),
+            "max_lag_ms": round(self.max_lag * 1000, 2)
+        }
+
+
+class EventBus:
+    """Olayları bir kez üretip ilgili tüm sink'lerin kuyruğuna dağıtır"""
+
+    def __init__(self):
+        self.sinks = []
+        self.started = False
+
+    def register(self, sink):
+        """Yeni bir sink ekle (yol çalışıyorsa sink hemen başlatılır)"""
+        self.sinks.append(sink)
+        if self.started:
+            sink.start()
+        logger.info("Sink eklendi: %s (%s, kuyruk: %d)", sink.name, sink.policy, sink.queue_size)
+        return sink
+
+    def emit(self, event_type, data):
+        """Olayı yayınla; hiçbir zaman engellemez"""
+        event = Event(event_type, data)
+        for sink in self.sinks:
+            if event_type in sink.event_types:
+                sink.offer(event)
+        return event
+
+    def start(self):
+        """Tüm sink iş parçacıklarını başlat"""
+        self.started = True
+        for sink in self.sinks:
+            sink.start()
+
+    def stop(self, timeout=5.0):
+        """Tüm sink'leri durdur"""
+        self.started = False
+        for sink in self.sinks:
+            sink.stop(timeout)
+
+    def stats(self):
+        """Sink başına metrikler"""
+        return {sink.name: sink.stats() for sink in self.sinks}
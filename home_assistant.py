@@ -3,6 +3,7 @@
 Home Assistant entegrasyonu için işlevler
 """
 
+import json
 import requests
 import logging
 from datetime import datetime
@@ -19,39 +20,44 @@ class HomeAssistantManager:
         }
         self.api_url = f"{HOME_ASSISTANT_CONFIG['url']}/api/states/{HOME_ASSISTANT_CONFIG['sensor_name']}"
     
+    @staticmethod
+    def build_sensor_payload(detection_state):
+        """Sensör verisini JSON olarak oluştur"""
+        state = detection_state.as_dict()
+        return json.dumps({
+            "state": "on" if detection_state.active else "off",
+            "attributes": {
+                "friendly_name": "Hailo Fire Detection",
+                "device_class": "fire",
+                "fire_detected": detection_state.fire_detected,
+                "smoke_detected": detection_state.smoke_detected,
+                "last_fire_time": state["last_fire_time"],
+                "last_smoke_time": state["last_smoke_time"],
+                "detection_count": detection_state.detection_count,
+                "fire_confidence": detection_state.fire_confidence,
+                "smoke_confidence": detection_state.smoke_confidence,
+                "last_updated": state["last_updated"]
+            }
+        })
+    
     def update_sensor(self, detection_state):
-        """Home Assistant sensörünü güncelle"""
+        """Home Assistant sensörünü güncelle (detection_state: DetectionSnapshot)"""
         try:
-            # Sensör verisi oluştur
-            now = datetime.now().isoformat()
-            sensor_data = {
-                "state": "on" if detection_state["fire_detected"] or detection_state["smoke_detected"] else "off",
-                "attributes": {
-                    "friendly_name": "Hailo Fire Detection",
-                    "device_class": "fire",
-                    "fire_detected": detection_state["fire_detected"],
-                    "smoke_detected": detection_state["smoke_detected"],
-                    "last_fire_time": detection_state["last_fire_time"],
-                    "last_smoke_time": detection_state["last_smoke_time"],
-                    "detection_count": detection_state["detection_count"],
-                    "fire_confidence": detection_state["fire_confidence"],
-                    "smoke_confidence": detection_state["smoke_confidence"],
-                    "last_updated": now
-                }
-            }
+            # Sensör verisi anlık görüntü sürümü başına bir kez oluşturulur
+            sensor_data = detection_state.cached("home_assistant", self.build_sensor_payload)
             
             # Home Assistant API'sine gönder
-            response = requests.post(self.api_url, headers=self.headers, json=sensor_data)
+            response = requests.post(self.api_url, headers=self.headers, data=sensor_data)
             
             if response.status_code == 200 or response.status_code == 201:
-                logger.info(f"Home Assistant sensörü güncellendi: {HOME_ASSISTANT_CONFIG['sensor_name']}")
+                logger.info("Home Assistant sensörü güncellendi: %s", HOME_ASSISTANT_CONFIG['sensor_name'])
                 return True
             else:
-                logger.error(f"Home Assistant sensörü güncellenemedi. Durum kodu: {response.status_code}, Yanıt: {response.text}")
+                logger.error("Home Assistant sensörü güncellenemedi. Durum kodu: %s, Yanıt: %s", response.status_code, response.text)
                 return False
                 
         except Exception as e:
-            logger.error(f"Home Assistant güncelleme hatası: {str(e)}")
+            logger.error("Home Assistant güncelleme hatası: %s", e)
             return False
     
     def create_initial_sensor(self):
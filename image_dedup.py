@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Algısal özet (dHash) ile neredeyse aynı tespit görüntülerinin tekrarını önleme
+"""
+
+import time
+import threading
+import logging
+
+import cv2
+import numpy as np
+
+# Loglama
+logger = logging.getLogger("hailo_fire_smoke_detection.image_dedup")
+
+
+def dhash(frame, hash_size=8):
+    """Küçük gri tonlamalı küçük resim üzerinden fark özeti (dHash) hesapla"""
+    # Önce küçült, sonra gri tonlamaya çevir: tam çözünürlükte renk dönüşümü yapılmaz
+    small = cv2.resize(frame, (hash_size + 1, hash_size), interpolation=cv2.INTER_AREA)
+    if small.ndim == 3:
+        small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+
+    bits = small[:, 1:] > small[:, :-1]
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def hamming_distance(a, b):
+    """İki özet arasındaki farklı bit sayısı"""
+    return bin(a ^ b).count("1")
+
+
+def event_key(camera, fire_detected, smoke_detected):
+    """Kamera ve olay türünden tekilleştirme anahtarı oluştur"""
+    if fire_detected and smoke_detected:
+        event = "fire+smoke"
+    elif fire_detected:
+        event = "fire"
+    elif smoke_detected:
+        event = "smoke"
+    else:
+        event = "none"
+    return (camera, event)
+
+
+class SnapshotDeduplicator:
+    """
+    Aynı kamera ve olay için son saklanan/yayınlanan görüntüye belirli bir
+    Hamming mesafesinden yakın olan görüntüleri atlar.
+    Olay bittiğinde (reset) ya da son özet max_age saniyeden eskiyse yeni olayın
+    ilk görüntüsü her zaman tutulur.
+    """
+
+    def __init__(self, name, max_distance=6, hash_size=8, max_age=300, enabled=True):
+        self.name = name
+        self.max_distance = max_distance
+        self.hash_size = hash_size
+        self.max_age = max_age
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        self.last_hashes = {}  # anahtar -> (son tutulan özet, monotonik zaman)
+        self.kept = 0
+        self.suppressed = 0
+
+    def should_keep(self, key, frame, now=None):
+        """Görüntü saklanmalı/yayınlanmalıysa True döndür ve son özeti güncelle"""
+        if not self.enabled:
+            return True
+
+        now = time.monotonic() if now is None else now
+        frame_hash = dhash(frame, self.hash_size)
+
+        with self.lock:
+            last = self.last_hashes.get(key)
+            if (last is not None and (not self.max_age or now - last[1] <= self.max_age)
+                    and hamming_distance(frame_hash, last[0]) <= self.max_distance):
+                self.suppressed += 1
+                logger.debug("%s: benzer görüntü atlandı %s", self.name, key)
+                return False
+
+            self.last_hashes[key] = (frame_hash, now)
+            self.kept += 1
+            return True
+
+    def reset(self, camera):
+        """Kameranın tespit durumu sıfırlandığında tüm olay anahtarlarını temizle"""
+        with self.lock:
+            for key in [k for k in self.last_hashes if k[0] == camera]:
+                del self.last_hashes[key]
+
+    def stats(self):
+        """Tutulan ve bastırılan görüntü sayıları"""
+        with self.lock:
+            return {"kept": self.kept, "suppressed": self.suppressed}
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Birden fazla cihaz / DeGirum AI sunucusu üzerinde çıkarım işçi havuzu
+"""
+
+import time
+import logging
+import threading
+
+# Loglama
+logger = logging.getLogger("hailo_fire_smoke_detection.inference_pool")
+
+
+class InferenceWorker:
+    """Tek bir model tanıtıcısını (yerel cihaz ya da AI sunucusu) saran işçi"""
+
+    def __init__(self, name, model):
+        self.name = name
+        self.model = model
+        self.outstanding = 0  # Devam eden istek sayısı
+        self.consecutive_failures = 0
+        self.avg_latency = None  # Üstel hareketli ortalama (saniye)
+        self.completed = 0
+        self.failed = 0
+        self.ejected_until = 0.0  # Bu zamana kadar havuz dışı
+
+    def is_available(self, now):
+        """İşçi şu anda iş alabilir mi"""
+        return now >= self.ejected_until
+
+    def stats(self):
+        """İşçi istatistiklerini döndür"""
+        return {
+            "outstanding": self.outstanding,
+            "avg_latency": self.avg_latency,
+            "completed": self.completed,
+            "failed": self.failed,
+            "ejected": self.ejected_until > time.monotonic()
+        }
+
+
+class InferencePool:
+    """
+    Kareleri en az bekleyen isteğe sahip işçiye dağıtır.
+    Hata veren ya da yavaşlayan işçiler belirli bir süre havuzdan çıkarılır,
+    istek ise akış kesilmeden bir sonraki uygun işçiye aktarılır.
+    """
+
+    def __init__(self, workers, max_failures=3, slow_latency=2.0, eject_seconds=30.0, latency_alpha=0.2):
+        if not workers:
+            raise ValueError("Çıkarım havuzu en az bir işçi gerektirir")
+
+        self.workers = list(workers)
+        self.max_failures = max_failures
+        self.slow_latency = slow_latency
+        self.eject_seconds = eject_seconds
+        self.latency_alpha = latency_alpha
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.workers)
+
+    def _acquire(self, exclude):
+        """En az bekleyen isteğe sahip uygun işçiyi seç ve rezerve et"""
+        with self.lock:
+            now = time.monotonic()
+            candidates = [w for w in self.workers if w not in exclude and w.is_available(now)]
+
+            if not candidates:
+                # Tüm işçiler havuz dışıysa, en erken geri dönecek olanı dene
+                candidates = [w for w in self.workers if w not in exclude]
+                if not candidates:
+                    return None
+                worker = min(candidates, key=lambda w: w.ejected_until)
+            else:
+                worker = min(candidates, key=lambda w: (w.outstanding, w.avg_latency or 0.0))
+
+            worker.outstanding += 1
+            return worker
+
+    def _eject(self, worker, reason):
+        """İşçiyi geçici olarak havuzdan çıkar (kilit tutulurken çağrılır)"""
+        worker.ejected_until = time.monotonic() + self.eject_seconds
+        worker.consecutive_failures = 0
+        logger.warning("Çıkarım işçisi havuzdan çıkarıldı: %s (%s), %.0f sn sonra yeniden denenecek",
+                       worker.name, reason, self.eject_seconds)
+
+    def _release(self, worker, latency=None, error=None):
+        """İstek sonucunu işçi istatistiklerine işle"""
+        with self.lock:
+            worker.outstanding -= 1
+            # Çıkarılmadan önce gönderilmiş istekler bekleme süresini yeniden başlatmasın
+            available = worker.is_available(time.monotonic())
+
+            if error is not None:
+                worker.failed += 1
+                worker.consecutive_failures += 1
+                if available and worker.consecutive_failures >= self.max_failures:
+                    self._eject(worker, f"{worker.consecutive_failures} ardışık hata")
+                return
+
+            worker.completed += 1
+            worker.consecutive_failures = 0
+            if worker.avg_latency is None:
+                worker.avg_latency = latency
+            else:
+                worker.avg_latency += self.latency_alpha * (latency - worker.avg_latency)
+
+            # Ortalama gecikme slow_latency eşiğini aşıyorsa ve iş devralacak başka uygun işçi varsa havuzdan çıkar
+            if not available or not self.slow_latency or worker.avg_latency <= self.slow_latency:
+                return
+            others = [w for w in self.workers if w is not worker and w.is_available(time.monotonic())]
+            if others:
+                worker.avg_latency = None
+                self._eject(worker, "yavaş yanıt")
+
+    def predict(self, model_input):
+        """Girdiyi uygun bir işçide çalıştır; hata durumunda diğer işçilere aktar"""
+        tried = []
+        last_error = None
+
+        while True:
+            worker = self._acquire(tried)
+            if worker is None:
+                break
+
+            tried.append(worker)
+            start_time = time.monotonic()
+            try:
+                result = worker.model(model_input)
+            except Exception as e:
+                self._release(worker, error=e)
+                last_error = e
+                logger.error("Çıkarım işçisi hatası (%s): %s", worker.name, e)
+                continue
+
+            self._release(worker, latency=time.monotonic() - start_time)
+            return result
+
+        raise RuntimeError(f"Kullanılabilir çıkarım işçisi kalmadı: {last_error}")
+
+    def stats(self):
+        """Tüm işçilerin istatistiklerini döndür"""
+        with self.lock:
+            return {w.name: w.stats() for w in self.workers}
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Başsız cihazlar için MJPEG/HTTP canlı görüntü sunucusu
+"""
+
+import time
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import cv2
+
+from config import LIVE_VIEW_CONFIG
+
+# Loglama
+logger = logging.getLogger("hailo_fire_smoke_detection.live_view")
+
+BOUNDARY = "frame"
+
+
+class FrameBroadcaster:
+    """
+    En son işlenmiş kareyi tutar ve istemcilere dağıtır.
+    Tespit hattı yalnızca referans bırakır; JPEG kodlama istemci iş parçacıklarında,
+    her kare ve genişlik için yalnızca bir kez yapılır.
+    """
+
+    def __init__(self, jpeg_quality=80):
+        self.jpeg_quality = jpeg_quality
+        self.condition = threading.Condition()
+        self.frame = None
+        self.sequence = 0
+        self.encoded_sequence = None
+        self.encoded = {}  # Genişlik -> JPEG baytları (yalnızca son kare için)
+        self.encode_lock = threading.Lock()
+
+    def publish(self, frame):
+        """Yeni kareyi yayınla (tespit hattından çağrılır, kodlama yapmaz)"""
+        with self.condition:
+            self.frame = frame
+            self.sequence += 1
+            self.condition.notify_all()
+
+    def wait_for_frame(self, last_sequence, timeout=1.0):
+        """last_sequence'ten daha yeni bir kare gelene kadar bekle"""
+        with self.condition:
+            if self.sequence == last_sequence:
+                self.condition.wait(timeout)
+            return self.frame, self.sequence
+
+    def get_jpeg(self, frame, sequence, max_width):
+        """Kareyi istenen genişlikte JPEG olarak döndür, aynı kare için önbellekten ver"""
+        with self.encode_lock:
+            if self.encoded_sequence != sequence:
+                self.encoded_sequence = sequence
+                self.encoded = {}
+
+            height, width = frame.shape[:2]
+            target_width = min(width, max_width) if max_width else width
+
+            if target_width not in self.encoded:
+                if target_width < width:
+                    new_height = int(height * target_width / width)
+                    frame = cv2.resize(frame, (target_width, new_height), interpolation=cv2.INTER_AREA)
+                success, buffer = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality])
+                if not success:
+                    return None
+                self.encoded[target_width] = buffer.tobytes()
+
+            return self.encoded[target_width]
+
+
+class LiveViewRequestHandler(BaseHTTPRequestHandler):
+    """/stream.mjpg ve /snapshot.jpg isteklerini karşılar"""
+
+    server_version = "HailoFireLiveView/1.0"
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+    def _client_limits(self, query):
+        """İstemcinin istediği fps ve genişliği sunucu sınırlarına göre kırp"""
+        max_fps = LIVE_VIEW_CONFIG["max_fps"]
+        max_width = LIVE_VIEW_CONFIG["max_width"]
+
+        try:
+            fps = float(query.get("fps", [max_fps])[0])
+            width = int(query.get("width", [max_width])[0])
+        except ValueError:
+            fps, width = max_fps, max_width
+
+        fps = max(0.1, min(fps, max_fps))
+        width = max(16, min(width, max_width))
+        return fps, width
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+
+        if url.path in ("/", "/stream.mjpg"):
+            self._serve_stream(*self._client_limits(query))
+        elif url.path == "/snapshot.jpg":
+            self._serve_snapshot(self._client_limits(query)[1])
+        else:
+            self.send_error(404)
+
+    def _serve_snapshot(self, width):
+        broadcaster = self.server.broadcaster
+        frame, sequence = broadcaster.wait_for_frame(-1, timeout=0)
+        jpeg = broadcaster.get_jpeg(frame, sequence, width) if frame is not None else None
+
+        if jpeg is None:
+            self.send_error(503, "Henüz kare yok")
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "image/jpeg")
+        self.send_header("Content-Length", str(len(jpeg)))
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.wfile.write(jpeg)
+
+    def _serve_stream(self, fps, width):
+        broadcaster = self.server.broadcaster
+        min_interval = 1.0 / fps
+
+        self.send_response(200)
+        self.send_header("Content-Type", f"multipart/x-mixed-replace; boundary={BOUNDARY}")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+
+        logger.info("Canlı görüntü istemcisi bağlandı: %s (%.1f fps, %d px)", self.client_address[0], fps, width)
+        last_sequence = 0
+        last_sent = 0.0
+
+        try:
+            while self.server.running:
+                # Yavaş istemciler ara kareleri kaçırır; her zaman en son kare gönderilir
+                frame, sequence = broadcaster.wait_for_frame(last_sequence)
+                if frame is None or sequence == last_sequence:
+                    continue
+
+                # İstemci başına kare hızı sınırı
+                wait = min_interval - (time.monotonic() - last_sent)
+                if wait > 0:
+                    time.sleep(wait)
+                    frame, sequence = broadcaster.wait_for_frame(-1, timeout=0)
+
+                jpeg = broadcaster.get_jpeg(frame, sequence, width)
+                if jpeg is None:
+                    continue
+
+                self.wfile.write(f"--{BOUNDARY}\r\nContent-Type: image/jpeg\r\nContent-Length: {len(jpeg)}\r\n\r\n".encode())
+                self.wfile.write(jpeg)
+                self.wfile.write(b"\r\n")
+                last_sequence = sequence
+                last_sent = time.monotonic()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+        logger.info("Canlı görüntü istemcisi ayrıldı: %s", self.client_address[0])
+
+
+class LiveViewServer:
+    """Canlı görüntü HTTP sunucusunu arka planda çalıştırır"""
+
+    def __init__(self, broadcaster):
+        self.broadcaster = broadcaster
+        self.httpd = None
+        self.thread = None
+
+    def start(self):
+        """HTTP sunucusunu başlat"""
+        try:
+            self.httpd = ThreadingHTTPServer((LIVE_VIEW_CONFIG["host"], LIVE_VIEW_CONFIG["port"]), LiveViewRequestHandler)
+        except OSError as e:
+            logger.error(f"Canlı görüntü sunucusu başlatılamadı: {str(e)}")
+            return False
+
+        self.httpd.daemon_threads = True
+        self.httpd.broadcaster = self.broadcaster
+        self.httpd.running = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name="live_view", daemon=True)
+        self.thread.start()
+        logger.info(f"Canlı görüntü sunucusu başlatıldı: http://{LIVE_VIEW_CONFIG['host']}:{LIVE_VIEW_CONFIG['port']}/stream.mjpg")
+        return True
+
+    def stop(self):
+        """HTTP sunucusunu durdur"""
+        if self.httpd is not None:
+            self.httpd.running = False
+            self.httpd.shutdown()
+            self.httpd.server_close()
+            logger.info("Canlı görüntü sunucusu durduruldu")
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+İş parçacıkları arasında paylaşılan basit performans metrikleri
+"""
+
+import threading
+
+
+class Metrics:
+    """Sayaçlar, anlık değerler ve gecikme gözlemleri için iş parçacığı güvenli kayıt"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = {}
+        self.gauges = {}
+        self.observations = {}  # isim -> [adet, toplam, son, en büyük]
+
+    def inc(self, name, value=1):
+        """Sayacı artır"""
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def set(self, name, value):
+        """Anlık değeri ayarla"""
+        with self.lock:
+            self.gauges[name] = value
+
+    def observe(self, name, value):
+        """Bir gözlem ekle (ör. milisaniye cinsinden gecikme)"""
+        with self.lock:
+            entry = self.observations.get(name)
+            if entry is None:
+                self.observations[name] = [1, value, value, value]
+            else:
+                entry[0] += 1
+                entry[1] += value
+                entry[2] = value
+                entry[3] = max(entry[3], value)
+
+    def snapshot(self, reset_observations=True):
+        """Tüm metrikleri sözlük olarak döndür; gözlemler varsayılan olarak sıfırlanır"""
+        with self.lock:
+            snapshot = dict(self.counters)
+            snapshot.update(self.gauges)
+            for name, (count, total, last, peak) in self.observations.items():
+                snapshot[name] = {
+                    "count": count,
+                    "avg": round(total / count, 2),
+                    "last": round(last, 2),
+                    "max": round(peak, 2)
+                }
+            if reset_observations:
+                self.observations = {}
+            return snapshot
@@ -9,7 +9,8 @@ import base64
 import cv2
 import paho.mqtt.client as mqtt
 from datetime import datetime
-from config import MQTT_CONFIG
+from config import CONFIG, MQTT_CONFIG, DEDUP_CONFIG
+from image_dedup import SnapshotDeduplicator, event_key
 
 # Loglama
 logger = logging.getLogger("hailo_fire_smoke_detection.mqtt")
@@ -19,6 +20,15 @@ class MQTTManager:
         self.client = None
         self.connected = False
         
+        # Yayınlanan resimler için benzer görüntü filtresi
+        self.image_dedup = SnapshotDeduplicator(
+            "mqtt",
+            max_distance=DEDUP_CONFIG["max_distance"],
+            hash_size=DEDUP_CONFIG["hash_size"],
+            max_age=DEDUP_CONFIG["max_age"],
+            enabled=DEDUP_CONFIG["enabled"]
+        )
+        
     def connect(self):
         """MQTT sunucusuna bağlan ve gerekli yapılandırmaları ayarla"""
         if not MQTT_CONFIG["enabled"]:
@@ -90,31 +100,35 @@ class MQTTManager:
             logger.error(f"MQTT discovery yapılandırma hatası: {str(e)}")
     
     def update_state(self, detection_state, processed_frame=None, force=False):
-        """MQTT aracılığıyla durumu güncelle"""
+        """MQTT aracılığıyla durumu güncelle (detection_state: DetectionSnapshot)"""
         if not self.connected or not MQTT_CONFIG["enabled"]:
             return
             
         try:
             # Durum verilerini yayınla
-            self.client.publish(MQTT_CONFIG["state_topic"], json.dumps(detection_state), qos=1, retain=True)
+            # JSON, anlık görüntü sürümü başına bir kez üretilir
+            self.client.publish(MQTT_CONFIG["state_topic"], detection_state.to_json(), qos=1, retain=True)
             
             # Tespit durumunda resim gönder
-            if processed_frame is not None and (detection_state["fire_detected"] or detection_state["smoke_detected"]):
-                self.send_image(processed_frame)
+            if processed_frame is not None and detection_state.active:
+                key = event_key(CONFIG["camera_name"], detection_state.fire_detected, detection_state.smoke_detected)
+                self.send_image(processed_frame, key)
                 
             logger.debug("MQTT durumu güncellendi")
                 
         except Exception as e:
-            logger.error(f"MQTT güncelleme hatası: {str(e)}")
-            import traceback
-            logger.error(traceback.format_exc())
+            logger.error("MQTT güncelleme hatası: %s", e, exc_info=True)
     
-    def send_image(self, frame):
+    def send_image(self, frame, key=None):
         """MQTT üzerinden base64 ile kodlanmış bir resim gönder"""
         if not self.connected:
             return
             
         try:
+            # Son yayınlanan resme çok benziyorsa gönderme
+            if key is not None and not self.image_dedup.should_keep(key, frame):
+                return
+            
             # Resmi yeniden boyutlandır ve kalitesini düşür (daha hızlı iletim için)
             max_width = 640
             height, width = frame.shape[:2]
@@ -136,7 +150,17 @@ class MQTTManager:
                 self.client.publish(MQTT_CONFIG["image_topic"], jpg_as_text, qos=0, retain=True)
                 logger.debug("MQTT üzerinden tespit resmi gönderildi")
         except Exception as e:
-            logger.error(f"MQTT resim gönderme hatası: {str(e)}")
+            logger.error("MQTT resim gönderme hatası: %s", e)
+    
+    def publish_metrics(self, metrics):
+        """Performans metriklerini (gecikme, atılan kareler vb.) yayınla"""
+        if not self.connected:
+            return
+            
+        try:
+            self.client.publish(MQTT_CONFIG["metrics_topic"], json.dumps(metrics), qos=0, retain=False)
+        except Exception as e:
+            logger.error("MQTT metrik gönderme hatası: %s", e)
     
     def set_offline(self):
         """Sistem çıkışında offline durumunu bildir"""
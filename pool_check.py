@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Çıkarım havuzunun farklı hızlardaki sahte işçilerle yerel denetimi (model ya da cihaz gerektirmez).
+Hızlı, yavaş ve hata veren işçiler eşzamanlı isteklerle çalıştırılır; hiçbir isteğin
+kaybolmadığı ve yavaş/hatalı işçilerin yalnızca bir kez havuzdan çıkarıldığı kontrol edilir.
+
+Kullanım:
+    python pool_check.py --requests 400 --clients 4
+"""
+
+import sys
+import time
+import logging
+import argparse
+import threading
+
+from inference_pool import InferencePool, InferenceWorker
+
+
+class StubModel:
+    """Belirli bir gecikmeyle yanıt veren ya da her çağrıda hata fırlatan sahte model"""
+
+    def __init__(self, name, latency, fail=False):
+        self.name = name
+        self.latency = latency
+        self.fail = fail
+
+    def __call__(self, model_input):
+        time.sleep(self.latency)
+        if self.fail:
+            raise RuntimeError(f"{self.name} cihaz hatası")
+        return self.name
+
+
+class EjectionCounter(logging.Handler):
+    """Havuzun işçi çıkarma uyarılarını işçi adına göre sayar"""
+
+    def __init__(self, names):
+        super().__init__(logging.WARNING)
+        self.counts = {name: 0 for name in names}
+
+    def emit(self, record):
+        # Çıkarma uyarısı WARNING, istek başına hata kaydı ERROR seviyesindedir
+        if record.levelno != logging.WARNING:
+            return
+        worker_name = record.args[0] if record.args else None
+        if worker_name in self.counts:
+            self.counts[worker_name] += 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Çıkarım havuzu sahte işçi denetimi")
+    parser.add_argument("--requests", type=int, default=400, help="Toplam istek sayısı")
+    parser.add_argument("--clients", type=int, default=4, help="Eşzamanlı istemci (işleme iş parçacığı) sayısı")
+    parser.add_argument("--fast", type=float, default=0.005, help="Hızlı işçi gecikmesi (sn)")
+    parser.add_argument("--slow", type=float, default=0.2, help="Yavaş işçi gecikmesi (sn)")
+    args = parser.parse_args()
+
+    workers = [
+        InferenceWorker("fast-1", StubModel("fast-1", args.fast)),
+        InferenceWorker("fast-2", StubModel("fast-2", args.fast)),
+        InferenceWorker("slow", StubModel("slow", args.slow)),
+        InferenceWorker("failing", StubModel("failing", args.fast, fail=True)),
+    ]
+    # Bekleme süresi denetim süresinden uzun: her işçi en fazla bir kez çıkarılmalı
+    pool = InferencePool(workers, max_failures=3, slow_latency=args.slow / 2, eject_seconds=60)
+
+    counter = EjectionCounter([w.name for w in workers])
+    pool_logger = logging.getLogger("hailo_fire_smoke_detection.inference_pool")
+    pool_logger.addHandler(counter)
+    pool_logger.propagate = False
+
+    results = {}
+    errors = []
+    lock = threading.Lock()
+    remaining = [args.requests]
+
+    def client():
+        while True:
+            with lock:
+                if remaining[0] == 0:
+                    return
+                remaining[0] -= 1
+            try:
+                name = pool.predict(None)
+            except Exception as e:
+                with lock:
+                    errors.append(e)
+                continue
+            with lock:
+                results[name] = results.get(name, 0) + 1
+
+    start_time = time.perf_counter()
+    threads = [threading.Thread(target=client) for _ in range(args.clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start_time
+
+    print(f"{args.requests} istek, {args.clients} istemci, {elapsed:.2f} sn")
+    for name, stats in pool.stats().items():
+        print(f"{name:<10} yanıt: {results.get(name, 0):5d}   hata: {stats['failed']:3d}   "
+              f"çıkarılma: {counter.counts[name]}   havuz dışı: {stats['ejected']}")
+
+    problems = []
+    if errors or sum(results.values()) != args.requests:
+        problems.append(f"kaybolan istek: {args.requests - sum(results.values())}")
+    for name in ("slow", "failing"):
+        if counter.counts[name] != 1:
+            problems.append(f"{name} işçisi {counter.counts[name]} kez çıkarıldı (beklenen 1)")
+    for name in ("fast-1", "fast-2"):
+        if counter.counts[name]:
+            problems.append(f"{name} işçisi çıkarıldı")
+
+    if problems:
+        print("HATA: " + "; ".join(problems))
+        sys.exit(1)
+    print("Tamam: tüm istekler yanıtlandı, yavaş ve hatalı işçiler birer kez çıkarıldı")
+
+
+if __name__ == "__main__":
+    main()
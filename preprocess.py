@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Önceden ayrılmış tamponlarla bellek ayırmasız kare yakalama ve ön işleme
+"""
+
+import threading
+from collections import deque
+
+import cv2
+import numpy as np
+
+LETTERBOX_COLOR = 114  # Letterbox dolgu rengi (gri)
+
+
+class FrameBufferPool:
+    """
+    Yakalanan kareler için yeniden kullanılabilir tampon havuzu.
+    Kuyrukta ve işlemede bekleyen kare sayısı kadar tampon zamanla oluşur,
+    sonrasında her cap.read() mevcut bir tampona yazar.
+    """
+
+    def __init__(self, max_free=32):
+        self.max_free = max_free
+        self.lock = threading.Lock()
+        self.free = deque()
+        self.shape = None
+        self.allocations = 0
+        self.reuses = 0
+
+    def acquire(self):
+        """Boş bir tampon döndür; kare boyutu henüz bilinmiyorsa None"""
+        with self.lock:
+            if self.free:
+                self.reuses += 1
+                return self.free.pop()
+            if self.shape is None:
+                return None
+            self.allocations += 1
+            return np.empty(self.shape, dtype=np.uint8)
+
+    def adopt(self, frame, buffer):
+        """cap.read() sonrasında çağrılır; OpenCV yeni dizi ayırdıysa havuzu güncelle"""
+        if frame is buffer:
+            return
+        with self.lock:
+            self.allocations += 1
+            if frame.shape != self.shape:
+                # Akış çözünürlüğü değişti, eski tamponları bırak
+                self.shape = frame.shape
+                self.free.clear()
+
+    def release(self, frame):
+        """Artık kullanılmayan kareyi havuza geri ver"""
+        if frame is None:
+            return
+        with self.lock:
+            if frame.shape == self.shape and len(self.free) < self.max_free:
+                self.free.append(frame)
+
+    def stats(self):
+        """Havuz istatistikleri"""
+        with self.lock:
+            return {"allocations": self.allocations, "reuses": self.reuses, "free": len(self.free)}
+
+
+class Preprocessor:
+    """
+    Kareyi model girişine (640x640) sabit hedef tampona yeniden boyutlandırır.
+    Her işleme iş parçacığı kendi örneğini kullanır; renk dönüşümü ve
+    normalizasyon DeGirum tarafında (input_numpy_colorspace = "BGR") yapılır.
+    """
+
+    def __init__(self, input_size=640, letterbox=False):
+        self.input_size = input_size
+        self.letterbox = letterbox
+        self.input = np.full((input_size, input_size, 3), LETTERBOX_COLOR, dtype=np.uint8)
+        self.scratch = None
+        self.frame_shape = None
+        self.geometry = None  # (ölçek, x dolgusu, y dolgusu) - yalnızca letterbox modunda
+
+    def _update_geometry(self, frame_shape):
+        """Kare boyutu değiştiğinde letterbox geometrisini ve ara tamponu yeniden hesapla"""
+        height, width = frame_shape[:2]
+        scale = min(self.input_size / width, self.input_size / height)
+        new_width, new_height = int(round(width * scale)), int(round(height * scale))
+        pad_x, pad_y = (self.input_size - new_width) // 2, (self.input_size - new_height) // 2
+
+        self.scratch = np.empty((new_height, new_width, 3), dtype=np.uint8)
+        self.input.fill(LETTERBOX_COLOR)
+        self.geometry = (scale, pad_x, pad_y)
+        self.frame_shape = frame_shape
+
+    def prepare(self, frame):
+        """Kareyi model giriş tamponuna yaz ve tamponu döndür"""
+        if not self.letterbox:
+            cv2.resize(frame, (self.input_size, self.input_size), dst=self.input)
+            return self.input
+
+        if frame.shape != self.frame_shape:
+            self._update_geometry(frame.shape)
+
+        # Sütun dilimleri bitişik olmadığından önce ara tampona küçült, sonra kopyala
+        scale, pad_x, pad_y = self.geometry
+        new_height, new_width = self.scratch.shape[:2]
+        cv2.resize(frame, (new_width, new_height), dst=self.scratch, interpolation=cv2.INTER_LINEAR)
+        np.copyto(self.input[pad_y:pad_y + new_height, pad_x:pad_x + new_width], self.scratch)
+        return self.input
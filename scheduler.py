@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+İki kademeli tarama/doğrulama zamanlaması: sakin sahnelerde düşük hızda devriye,
+zayıf bir aday görüldüğünde sınırlı süreli yüksek hızlı doğrulama patlaması.
+Hızlandırıcı bütçesi kameralar arasında paylaşılır; toplam çıkarım hızı sabit kalır.
+"""
+
+import time
+import logging
+import threading
+
+# Loglama
+logger = logging.getLogger("hailo_fire_smoke_detection.scheduler")
+
+PATROL = "patrol"
+BURST = "burst"
+
+
+class CameraSchedule:
+    """Tek bir kameranın zamanlama durumu"""
+
+    def __init__(self):
+        self.mode = PATROL
+        self.next_due = 0.0
+        self.burst_started = None
+        self.burst_until = None
+        self.cooldown_until = 0.0  # Doğrulanmadan biten patlamadan sonra yeni patlama başlatılmaz
+
+
+class ScanConfirmScheduler:
+    """Kamera başına hangi karelerin çıkarıma gireceğine karar verir"""
+
+    def __init__(self, patrol_fps, burst_fps, budget_fps, burst_seconds,
+                 patrol_threshold, detection_threshold, burst_cooldown=30.0, metrics=None):
+        self.patrol_fps = patrol_fps
+        self.burst_fps = burst_fps
+        self.budget_fps = budget_fps
+        self.burst_seconds = burst_seconds
+        self.burst_cooldown = burst_cooldown
+        self.patrol_threshold = patrol_threshold
+        self.detection_threshold = detection_threshold
+        self.metrics = metrics
+        self.lock = threading.Lock()
+        self.cameras = {}
+
+    def register(self, camera):
+        """Kamerayı zamanlamaya ekle"""
+        with self.lock:
+            self.cameras.setdefault(camera, CameraSchedule())
+
+    def _rate(self, camera):
+        """
+        Paylaşılan bütçeye göre kameranın çıkarım hızı (kilit tutulurken çağrılır).
+        Devriyedeki kameralar önce patrol_fps alır, kalan bütçe doğrulamadaki kameralara bölünür.
+        """
+        bursting = [c for c in self.cameras.values() if c.mode == BURST]
+        patrolling = len(self.cameras) - len(bursting)
+
+        patrol_rate = self.patrol_fps
+        if patrol_rate * len(self.cameras) > self.budget_fps:
+            patrol_rate = self.budget_fps / len(self.cameras)
+
+        if self.cameras[camera].mode == PATROL:
+            return patrol_rate
+
+        remaining = self.budget_fps - patrol_rate * patrolling
+        return max(patrol_rate, min(self.burst_fps, remaining / len(bursting)))
+
+    def _end_burst(self, camera, schedule, reason):
+        """Doğrulama patlamasını bitir ve devriyeye dön (kilit tutulurken çağrılır)"""
+        schedule.mode = PATROL
+        schedule.burst_started = None
+        schedule.burst_until = None
+        logger.info("Doğrulama bitti (%s): %s, devriyeye dönülüyor", camera, reason)
+
+    def admit(self, camera, now=None):
+        """Bu kameranın şimdiki karesi çıkarıma girmeli mi"""
+        now = time.monotonic() if now is None else now
+
+        with self.lock:
+            schedule = self.cameras[camera]
+            if schedule.mode == BURST and now >= schedule.burst_until:
+                # Süren zayıf aday (ör. parlama) kamerayı sürekli doğrulamada tutmasın
+                self._end_burst(camera, schedule, "süre doldu")
+                schedule.cooldown_until = now + self.burst_cooldown
+                if self.metrics is not None:
+                    self.metrics.inc("scheduler_bursts_expired")
+
+            if now < schedule.next_due:
+                return False
+
+            schedule.next_due = now + 1.0 / self._rate(camera)
+            return True
+
+    def report(self, camera, max_score, now=None):
+        """Çıkarım sonucundaki en yüksek skoru bildir; aday varsa patlama başlat"""
+        now = time.monotonic() if now is None else now
+
+        with self.lock:
+            schedule = self.cameras[camera]
+
+            if max_score > self.detection_threshold:
+                if schedule.mode == BURST:
+                    time_to_confirm = now - schedule.burst_started
+                    self._end_burst(camera, schedule, f"{time_to_confirm:.2f} sn içinde doğrulandı")
+                    if self.metrics is not None:
+                        self.metrics.inc("scheduler_bursts_confirmed")
+                        self.metrics.observe("time_to_confirm_seconds", time_to_confirm)
+                return
+
+            if max_score >= self.patrol_threshold and schedule.mode == PATROL and now >= schedule.cooldown_until:
+                # Zayıf aday: sınırlı süreli yüksek hızlı doğrulama (süre uzatılmaz)
+                schedule.mode = BURST
+                schedule.burst_started = now
+                schedule.burst_until = now + self.burst_seconds
+                schedule.next_due = now
+                logger.info("Zayıf aday (%s, skor %.2f), doğrulama başlatılıyor", camera, max_score)
+                if self.metrics is not None:
+                    self.metrics.inc("scheduler_bursts")
+
+    def stats(self):
+        """Kamera başına mod ve çıkarım hızı"""
+        with self.lock:
+            return {camera: {"mode": schedule.mode, "fps": round(self._rate(camera), 2)}
+                    for camera, schedule in self.cameras.items()}
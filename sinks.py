@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Olay yolu için çıkış hedefleri: MQTT, Home Assistant, disk, webhook, log ve bellek
+"""
+
+import time
+import logging
+from collections import deque
+
+import requests
+
+from config import CONFIG, HOME_ASSISTANT_CONFIG, MQTT_CONFIG, WEBHOOK_CONFIG, DEDUP_CONFIG, SINK_CONFIG
+from event_bus import Sink
+from image_dedup import SnapshotDeduplicator, event_key
+from utils import save_detection_image
+
+# Loglama
+logger = logging.getLogger("hailo_fire_smoke_detection.sinks")
+
+
+def _active_flags(state):
+    """Durumun sink'ler için önemli kısmı: (ateş, duman)"""
+    return (state.fire_detected, state.smoke_detected)
+
+
+class MQTTSink(Sink):
+    """Durumu, tespit resimlerini ve metrikleri MQTT üzerinden yayınlar"""
+
+    event_types = ("detection", "alert", "state")
+
+    def __init__(self, mqtt_manager, metrics, event_bus, queue_size=16, policy="coalesce"):
+        super().__init__("mqtt", queue_size, policy)
+        self.mqtt_manager = mqtt_manager
+        self.metrics = metrics
+        self.event_bus = event_bus
+        self.last_state_update = 0.0
+        self.last_flags = None
+
+    def handle(self, event):
+        data = event.data
+        state = data["state"]
+
+        if event.type == "alert":
+            # MQTT'yi güncelle ve resmi gönder
+            self.mqtt_manager.update_state(state, data["frame"])
+
+            # Yakalamadan uyarıya kadar geçen süre
+            if data.get("capture_time") is not None:
+                self.metrics.observe("capture_to_alert_ms", (time.monotonic() - data["capture_time"]) * 1000)
+        elif event.type == "detection":
+            self.mqtt_manager.update_state(state)
+        else:
+            # Periyodik güncelleme; durum değiştiyse hemen gönder
+            flags = _active_flags(state)
+            changed = flags != self.last_flags
+            if changed and not any(flags):
+                # Olay bitti: sonraki olayın ilk resmi mutlaka yayınlansın
+                self.mqtt_manager.image_dedup.reset(CONFIG["camera_name"])
+            if not changed and time.monotonic() - self.last_state_update < MQTT_CONFIG["update_interval"]:
+                return
+
+            self.mqtt_manager.update_state(state, data.get("frame"), force=changed)
+
+            # Gecikme, kare atma, tekilleştirme ve sink metriklerini yayınla
+            self.metrics.set("mqtt_snapshots", self.mqtt_manager.image_dedup.stats())
+            self.metrics.set("sinks", self.event_bus.stats())
+            self.mqtt_manager.publish_metrics(self.metrics.snapshot())
+
+            self.last_state_update = time.monotonic()
+            self.last_flags = flags
+
+    def stop(self, timeout=5.0):
+        super().stop(timeout)
+        # Çıkışta offline durumunu bildir
+        self.mqtt_manager.set_offline()
+
+
+class HomeAssistantSink(Sink):
+    """Home Assistant sensörünü uyarılarda ve periyodik olarak günceller"""
+
+    event_types = ("alert", "state")
+
+    def __init__(self, ha_manager, queue_size=16, policy="coalesce"):
+        super().__init__("home_assistant", queue_size, policy)
+        self.ha_manager = ha_manager
+        self.last_update = 0.0
+        self.last_flags = None
+
+    def handle(self, event):
+        state = event.data["state"]
+        flags = _active_flags(state)
+
+        if event.type == "state":
+            # Sadece tespit varsa ya da durum değiştiyse güncelle (gereksiz API çağrılarını önlemek için)
+            changed = self.last_flags is not None and flags != self.last_flags
+            due = any(flags) and time.monotonic() - self.last_update >= HOME_ASSISTANT_CONFIG["update_interval"]
+            if not changed and not due:
+                self.last_flags = flags
+                return
+
+        self.ha_manager.update_sensor(state)
+        self.last_update = time.monotonic()
+        self.last_flags = flags
+
+
+class DiskSink(Sink):
+    """Tespit edilen kareleri benzer görüntüleri atlayarak diske kaydeder"""
+
+    event_types = ("detection", "alert", "state")
+
+    def __init__(self, metrics, queue_size=4, policy="coalesce"):
+        super().__init__("disk", queue_size, policy)
+        self.metrics = metrics
+        self.dedup = SnapshotDeduplicator(
+            "disk",
+            max_distance=DEDUP_CONFIG["max_distance"],
+            hash_size=DEDUP_CONFIG["hash_size"],
+            max_age=DEDUP_CONFIG["max_age"],
+            enabled=DEDUP_CONFIG["enabled"]
+        )
+        self.last_flags = None
+
+    def handle(self, event):
+        state = event.data["state"]
+        flags = _active_flags(state)
+
+        if event.type == "state":
+            # Olay bitti: sonraki olayın ilk karesi mutlaka kaydedilsin
+            if self.last_flags is not None and any(self.last_flags) and not any(flags):
+                self.dedup.reset(CONFIG["camera_name"])
+            self.last_flags = flags
+            return
+
+        self.last_flags = flags
+        key = event_key(CONFIG["camera_name"], *flags)
+        save_detection_image(event.data["frame"], self.dedup, key)
+        self.metrics.set("disk_snapshots", self.dedup.stats())
+
+
+class WebhookSink(Sink):
+    """Uyarıları ve durum değişikliklerini bir HTTP webhook'una JSON olarak gönderir"""
+
+    event_types = ("alert", "state")
+
+    def __init__(self, url, timeout=5, queue_size=16, policy="coalesce"):
+        super().__init__("webhook", queue_size, policy)
+        self.url = url
+        self.timeout = timeout
+        self.last_flags = None
+
+    def handle(self, event):
+        state = event.data["state"]
+        flags = _active_flags(state)
+
+        if event.type == "state":
+            changed = self.last_flags is not None and flags != self.last_flags
+            self.last_flags = flags
+            if not changed:
+                return
+        else:
+            self.last_flags = flags
+
+        payload = {"event": event.type, "state": state.as_dict(), "detections": event.data.get("detections", [])}
+        response = requests.post(self.url, json=payload, timeout=self.timeout)
+        if response.status_code >= 300:
+            logger.error("Webhook isteği başarısız. Durum kodu: %s", response.status_code)
+
+
+class LogSink(Sink):
+    """Uyarıları ve durum değişikliklerini günlüğe yazar"""
+
+    event_types = ("alert", "state")
+
+    def __init__(self, queue_size=64, policy="drop_oldest"):
+        super().__init__("log", queue_size, policy)
+        self.last_flags = None
+
+    def handle(self, event):
+        flags = _active_flags(event.data["state"])
+
+        if event.type == "alert":
+            logger.warning("UYARI: %d yangın/duman tespit edildi!", len(event.data["detections"]))
+        elif self.last_flags is not None and flags != self.last_flags and not any(flags):
+            logger.info("Yangın/duman tespit durumu sıfırlandı")
+
+        self.last_flags = flags
+
+
+class MemorySink(Sink):
+    """Olayları bellekte tutar; yerel testler ve hata ayıklama için"""
+
+    event_types = ("detection", "alert", "state")
+
+    def __init__(self, max_events=1000, queue_size=256, policy="drop_oldest"):
+        super().__init__("memory", queue_size, policy)
+        self.events = deque(maxlen=max_events)
+
+    def handle(self, event):
+        self.events.append(event)
+
+
+def create_sinks(event_bus, metrics, mqtt_manager, ha_manager, mqtt_connected):
+    """Yapılandırmaya göre sink'leri oluştur ve olay yoluna kaydet"""
+    if mqtt_connected:
+        event_bus.register(MQTTSink(mqtt_manager, metrics, event_bus, **SINK_CONFIG["mqtt"]))
+
+    event_bus.register(HomeAssistantSink(ha_manager, **SINK_CONFIG["home_assistant"]))
+
+    if CONFIG["save_detections"]:
+        event_bus.register(DiskSink(metrics, **SINK_CONFIG["disk"]))
+
+    if WEBHOOK_CONFIG["enabled"]:
+        event_bus.register(WebhookSink(WEBHOOK_CONFIG["url"], WEBHOOK_CONFIG["timeout"], **SINK_CONFIG["webhook"]))
+
+    event_bus.register(LogSink(**SINK_CONFIG["log"]))
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+İş parçacığı aşamaları için kalp atışı tabanlı denetleyici.
+Çöken ya da takılan bir aşama, modeli yeniden yüklemeden ve diğer aşamaları
+durdurmadan üstel geri çekilme ile yerinde yeniden başlatılır.
+"""
+
+import time
+import logging
+import threading
+
+# Loglama
+logger = logging.getLogger("hailo_fire_smoke_detection.supervisor")
+
+
+class StageContext:
+    """Bir aşamanın tek bir çalıştırmasına verilen tanıtıcı"""
+
+    def __init__(self, stage, supervisor):
+        self.stage = stage
+        self.supervisor = supervisor
+        self.cancelled = False
+
+    @property
+    def running(self):
+        """Bu çalıştırma devam etmeli mi (yeniden başlatıldıysa False olur)"""
+        return not self.cancelled and self.supervisor.running
+
+    def heartbeat(self, progress=False):
+        """Aşamanın canlı olduğunu bildir; progress=True ise bir iş birimi tamamlandı"""
+        if not self.cancelled:
+            self.stage.beat(progress, self.supervisor.metrics)
+
+
+class Stage:
+    """Denetlenen tek bir aşama (ör. yakalama, işleme, görüntüleme)"""
+
+    def __init__(self, name, target, stall_timeout=None):
+        self.name = name
+        self.target = target  # target(ctx)
+        self.stall_timeout = stall_timeout
+        self.thread = None
+        self.context = None
+        self.last_heartbeat = time.monotonic()
+        self.progress = 0
+        self.restarts = 0
+        self.consecutive_failures = 0
+        self.failed_at = None  # Arıza tespit zamanı (kurtarma süresi için)
+        self.restart_at = None  # Planlanan yeniden başlatma zamanı
+        self.last_recovery = None
+
+    def beat(self, progress, metrics):
+        """Kalp atışı ve ilerleme sayacını güncelle"""
+        now = time.monotonic()
+        self.last_heartbeat = now
+        if not progress:
+            return
+
+        self.progress += 1
+        if self.failed_at is not None:
+            # Yeniden başlatılan aşama ilk işini tamamladı: kurtarma süresini kaydet
+            self.last_recovery = now - self.failed_at
+            self.failed_at = None
+            self.consecutive_failures = 0
+            logger.info("Aşama kurtarıldı: %s (%.1f sn)", self.name, self.last_recovery)
+            if metrics is not None:
+                metrics.observe("stage_recovery_seconds", self.last_recovery)
+
+    def stats(self):
+        """Aşama durumu"""
+        return {
+            "alive": self.thread is not None and self.thread.is_alive(),
+            "progress": self.progress,
+            "restarts": self.restarts,
+            "heartbeat_age": round(time.monotonic() - self.last_heartbeat, 2),
+            "recovering": self.failed_at is not None,
+            "last_recovery_seconds": round(self.last_recovery, 2) if self.last_recovery is not None else None
+        }
+
+
+class Supervisor:
+    """Aşamaları başlatır, kalp atışlarını izler ve gerekirse yeniden başlatır"""
+
+    def __init__(self, metrics=None, backoff_base=1.0, backoff_max=60.0):
+        self.metrics = metrics
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.stages = []
+        self.running = False
+
+    def add_stage(self, name, target, stall_timeout=None):
+        """Denetlenecek yeni bir aşama ekle"""
+        stage = Stage(name, target, stall_timeout)
+        self.stages.append(stage)
+        return stage
+
+    def _launch(self, stage):
+        """Aşamayı yeni bir bağlamla yeni bir iş parçacığında başlat"""
+        stage.context = StageContext(stage, self)
+        stage.last_heartbeat = time.monotonic()
+        stage.restart_at = None
+        # Takılan eski iş parçacıkları kapanışı engellemesin diye daemon
+        stage.thread = threading.Thread(target=self._run_stage, args=(stage, stage.context),
+                                        name=stage.name, daemon=True)
+        stage.thread.start()
+
+    def _run_stage(self, stage, ctx):
+        """Aşama hedefini çalıştır, beklenmeyen hataları günlüğe yaz"""
+        try:
+            stage.target(ctx)
+        except Exception as e:
+            logger.error("Aşama hatası (%s): %s", stage.name, e, exc_info=True)
+
+    def start(self):
+        """Tüm aşamaları başlat"""
+        self.running = True
+        for stage in self.stages:
+            self._launch(stage)
+
+    def _fail(self, stage, reason, now):
+        """Aşamayı arızalı işaretle ve geri çekilme ile yeniden başlatmayı planla"""
+        if stage.context is not None:
+            # Eski iş parçacığı döndüğünde kendi kendine çıkar
+            stage.context.cancelled = True
+
+        if stage.failed_at is None:
+            stage.failed_at = now
+        stage.consecutive_failures += 1
+        stage.restarts += 1
+
+        delay = min(self.backoff_max, self.backoff_base * 2 ** (stage.consecutive_failures - 1))
+        stage.restart_at = now + delay
+        logger.warning("Aşama %s: %s, %.1f sn sonra yeniden başlatılacak", stage.name, reason, delay)
+
+        if self.metrics is not None:
+            self.metrics.inc(f"stage_restarts_{stage.name}")
+
+    def check(self):
+        """Aşamaları denetle; ana döngüden periyodik olarak çağrılır"""
+        if not self.running:
+            return
+
+        now = time.monotonic()
+        for stage in self.stages:
+            if stage.restart_at is not None:
+                if now >= stage.restart_at:
+                    logger.info("Aşama yeniden başlatılıyor: %s", stage.name)
+                    self._launch(stage)
+                continue
+
+            if not stage.thread.is_alive():
+                self._fail(stage, "iş parçacığı durdu", now)
+            elif stage.stall_timeout and now - stage.last_heartbeat > stage.stall_timeout:
+                self._fail(stage, f"{now - stage.last_heartbeat:.0f} sn kalp atışı yok", now)
+
+        if self.metrics is not None:
+            self.metrics.set("stages", self.stats())
+
+    def stop(self, timeout=5.0):
+        """Tüm aşamaları durdur; takılı kalanlar için en fazla timeout kadar bekle"""
+        self.running = False
+        deadline = time.monotonic() + timeout
+        for stage in self.stages:
+            if stage.thread is not None:
+                stage.thread.join(max(0.0, deadline - time.monotonic()))
+                if stage.thread.is_alive():
+                    logger.warning("Aşama zamanında durmadı: %s", stage.name)
+
+    def stats(self):
+        """Aşama başına durum"""
+        return {stage.name: stage.stats() for stage in self.stages}
@@ -5,9 +5,15 @@ Yardımcı fonksiyonlar ve yardımcı sınıflar
 
 import cv2
 import os
+import json
+import time
+import queue
+import atexit
 import logging
+import threading
+import logging.handlers
 from datetime import datetime
-from config import CONFIG, DETECTION_DIR
+from config import CONFIG, DETECTION_DIR, LOGGING_CONFIG
 
 # Loglama
 logger = logging.getLogger("hailo_fire_smoke_detection.utils")
@@ -16,18 +22,179 @@ def setup_directories():
     """Gerekli dizinleri oluştur"""
     os.makedirs(DETECTION_DIR, exist_ok=True)
     
+class RateLimitFilter(logging.Filter):
+    """Aynı mesajı belirli bir zaman penceresinde yalnızca bir kez geçirir"""
+    
+    def __init__(self, window_seconds):
+        super().__init__()
+        self.window_seconds = window_seconds
+        self.lock = threading.Lock()
+        self.seen = {}  # (logger, seviye, mesaj) -> [son geçiş zamanı, bastırılan sayısı]
+    
+    def filter(self, record):
+        if not self.window_seconds:
+            return True
+        
+        key = (record.name, record.levelno, record.getMessage())
+        now = time.monotonic()
+        
+        with self.lock:
+            entry = self.seen.get(key)
+            if entry is not None and now - entry[0] < self.window_seconds:
+                entry[1] += 1
+                return False
+            
+            suppressed = entry[1] if entry is not None else 0
+            self.seen[key] = [now, 0]
+            
+            # Eski kayıtları temizle
+            if len(self.seen) > 1000:
+                self.seen = {k: v for k, v in self.seen.items() if now - v[0] < self.window_seconds}
+        
+        if suppressed:
+            record.msg = f"{record.getMessage()} (son {self.window_seconds} sn içinde {suppressed} kez tekrarlandı)"
+            record.args = None
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """Log kayıtlarını tek satırlık JSON olarak biçimlendir"""
+    
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "message": record.getMessage()
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """Kuyruk doluysa kaydı atan, biçimlendirmeyi arka plan iş parçacığına bırakan handler"""
+    
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0  # Toplam atılan kayıt
+        self.unreported = 0  # Henüz bildirilmemiş atılan kayıt
+    
+    def prepare(self, record):
+        # Aynı süreç içindeki kuyruk için kaydı olduğu gibi aktar; mesaj ve traceback
+        # biçimlendirmesi dinleyici iş parçacığında yapılır
+        return record
+    
+    def _drop_note(self):
+        """Atılan kayıtları bildiren uyarı kaydı"""
+        return logging.makeLogRecord({
+            "name": "hailo_fire_smoke_detection.logging",
+            "levelno": logging.WARNING,
+            "levelname": "WARNING",
+            "msg": "Log kuyruğu dolu olduğu için %d kayıt atıldı (toplam %d)",
+            "args": (self.unreported, self.dropped)
+        })
+    
+    def enqueue(self, record):
+        # Handler kilidi altında çağrılır; sayaçlar için ek kilit gerekmez
+        try:
+            # Kuyrukta yer açıldığında önce kaybı bildir
+            if self.unreported:
+                self.queue.put_nowait(self._drop_note())
+                self.unreported = 0
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            self.unreported += 1
+
+
 def setup_logging():
-    """Loglama yapılandırmasını ayarla"""
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.StreamHandler(),
-            logging.FileHandler('fire_smoke_detection.log')
-        ]
+    """Loglama yapılandırmasını ayarla (kuyruk tabanlı, arka planda yazan)"""
+    if LOGGING_CONFIG["json_format"]:
+        formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    
+    stream_handler = logging.StreamHandler()
+    file_handler = logging.handlers.RotatingFileHandler(
+        LOGGING_CONFIG["file"],
+        maxBytes=LOGGING_CONFIG["max_bytes"],
+        backupCount=LOGGING_CONFIG["backup_count"],
+        encoding="utf-8"
     )
+    for handler in (stream_handler, file_handler):
+        handler.setFormatter(formatter)
+    
+    # Sıcak döngüler yalnızca kuyruğa yazar; disk ve konsol G/Ç'si dinleyici iş parçacığında yapılır
+    log_queue = queue.Queue(maxsize=LOGGING_CONFIG["queue_size"])
+    queue_handler = NonBlockingQueueHandler(log_queue)
+    queue_handler.addFilter(RateLimitFilter(LOGGING_CONFIG["rate_limit_seconds"]))
+    
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(LOGGING_CONFIG["level"])
+    
+    listener = logging.handlers.QueueListener(log_queue, stream_handler, file_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    
     return logging.getLogger("hailo_fire_smoke_detection")
 
+def parse_detections(result, original_size, threshold, input_size=640, letterbox=None):
+    """
+    DeGirum sonuçlarını orijinal kare koordinatlarına ölçeklenmiş tespit listesine dönüştür.
+    letterbox: giriş letterbox ile hazırlandıysa (ölçek, x dolgusu, y dolgusu)
+    """
+    detections = []
+    
+    if not (hasattr(result, 'results') and isinstance(result.results, list)):
+        return detections
+    
+    logger.debug("Tespit sonuçları: %d", len(result.results))
+    
+    for detection in result.results:
+        # 'bbox' alanını kontrol et
+        bbox = detection.get('bbox')
+        if bbox is None or len(bbox) != 4:
+            continue
+        
+        # Sınıf kimliğini ve skoru al
+        score = detection.get('score', 0)
+        if score <= threshold:
+            continue
+        
+        x1, y1, x2, y2 = map(float, bbox)
+        normalized = x1 <= 1.0 and y1 <= 1.0 and x2 <= 1.0 and y2 <= 1.0
+        
+        if letterbox is not None:
+            # Letterbox dolgusunu çıkar ve ölçeği geri al
+            scale, pad_x, pad_y = letterbox
+            if normalized:
+                x1, y1, x2, y2 = x1 * input_size, y1 * input_size, x2 * input_size, y2 * input_size
+            box = [int((x1 - pad_x) / scale), int((y1 - pad_y) / scale),
+                   int((x2 - pad_x) / scale), int((y2 - pad_y) / scale)]
+        else:
+            # Model normalize koordinat veriyorsa (0-1 arası) orijinal boyuta dönüştür
+            if normalized:
+                scale_x, scale_y = original_size[1], original_size[0]
+            else:
+                # Model giriş (640x640) koordinatlarını orijinal boyuta ölçekle
+                scale_x, scale_y = original_size[1] / input_size, original_size[0] / input_size
+            box = [int(x1 * scale_x), int(y1 * scale_y), int(x2 * scale_x), int(y2 * scale_y)]
+        
+        # DeGirum class_name değerini doğrudan döndürür
+        detections.append({
+            "box": box,
+            "score": float(score),
+            "class_id": int(detection.get('class_id', 0)),
+            "class_name": detection.get('class_name', '')
+        })
+    
+    return detections
+
 def draw_detections(frame, detections, class_names):
     """Tespitleri görüntü üzerine çiz"""
     for det in detections:
@@ -55,10 +222,13 @@ def draw_detections(frame, detections, class_names):
     
     return frame
 
-def save_detection_image(frame):
-    """Tespit edilen kareyi kaydet"""
+def save_detection_image(frame, deduplicator=None, key=None):
+    """Tespit edilen kareyi kaydet (deduplicator verilirse benzer kareler atlanır)"""
     if CONFIG["save_detections"]:
+        if deduplicator is not None and not deduplicator.should_keep(key, frame):
+            return
+        
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         detection_filename = f"{DETECTION_DIR}/detection_{timestamp}.jpg"
         cv2.imwrite(detection_filename, frame)
-        logger.info(f"Tespit kaydedildi: {detection_filename}")
+        logger.info("Tespit kaydedildi: %s", detection_filename)